@@ -0,0 +1,29 @@
+"""Add appointment type price
+
+Revision ID: 0b6f3d2e9a57
+Revises: 5d2b8e0f61c4
+Create Date: 2026-10-17 14:51:26.607113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6f3d2e9a57'
+down_revision: Union[str, Sequence[str], None] = '5d2b8e0f61c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases built by the app's old create_all already have the column
+    op.execute("ALTER TABLE appointment_types ADD COLUMN IF NOT EXISTS price VARCHAR")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('appointment_types', 'price')
@@ -0,0 +1,31 @@
+"""Store password reset otp digests
+
+Revision ID: 2f9c4b7e1d3a
+Revises: e7b1d5c3a820
+Create Date: 2026-10-17 19:42:17.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f9c4b7e1d3a'
+down_revision: Union[str, Sequence[str], None] = 'e7b1d5c3a820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Codes live for minutes; outstanding plaintext ones are dropped rather than hashed
+    op.execute("DELETE FROM password_reset_otps")
+    op.alter_column('password_reset_otps', 'otp', new_column_name='otp_hash')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM password_reset_otps")
+    op.alter_column('password_reset_otps', 'otp_hash', new_column_name='otp')
@@ -0,0 +1,28 @@
+"""Add booking start_time index
+
+Revision ID: 3c9e1d7a52b8
+Revises: fb7334efe494
+Create Date: 2026-10-17 12:31:08.552671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1d7a52b8'
+down_revision: Union[str, Sequence[str], None] = 'fb7334efe494'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_bookings_start_time'), 'bookings', ['start_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bookings_start_time'), table_name='bookings')
@@ -0,0 +1,28 @@
+"""Add slot range index
+
+Revision ID: 49a83571eae2
+Revises: 209754620499
+Create Date: 2026-10-17 09:12:40.318201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '49a83571eae2'
+down_revision: Union[str, Sequence[str], None] = '209754620499'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_slots_resource_id_start_time', 'slots', ['resource_id', 'start_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_slots_resource_id_start_time', table_name='slots')
@@ -0,0 +1,46 @@
+"""Add hot path indexes
+
+Revision ID: 5d2b8e0f61c4
+Revises: a41f6b2c9d03
+Create Date: 2026-10-17 13:40:19.305548
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8e0f61c4'
+down_revision: Union[str, Sequence[str], None] = 'a41f6b2c9d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_bookings_type_start_active',
+        'bookings',
+        ['appointment_type_id', 'start_time'],
+        unique=False,
+        postgresql_where=sa.text("status != 'CANCELLED'"),
+    )
+    op.create_index('ix_bookings_customer_start_id', 'bookings', ['customer_id', 'start_time', 'id'], unique=False)
+    # payments is created outside these migrations, so only index it where it exists
+    op.execute("""
+        DO $$
+        BEGIN
+            IF to_regclass('payments') IS NOT NULL THEN
+                CREATE INDEX IF NOT EXISTS ix_payments_booking_id ON payments (booking_id);
+            END IF;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_payments_booking_id")
+    op.drop_index('ix_bookings_customer_start_id', table_name='bookings')
+    op.drop_index('ix_bookings_type_start_active', table_name='bookings', postgresql_where=sa.text("status != 'CANCELLED'"))
@@ -0,0 +1,30 @@
+"""Add booking timestamps
+
+Revision ID: 7fe5ddcae60f
+Revises: fba5b18ddfdb
+Create Date: 2026-10-17 11:40:52.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7fe5ddcae60f'
+down_revision: Union[str, Sequence[str], None] = 'fba5b18ddfdb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('bookings', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.add_column('bookings', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('bookings', 'updated_at')
+    op.drop_column('bookings', 'created_at')
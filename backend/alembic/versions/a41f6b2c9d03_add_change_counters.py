@@ -0,0 +1,32 @@
+"""Add change counters
+
+Revision ID: a41f6b2c9d03
+Revises: 3c9e1d7a52b8
+Create Date: 2026-10-17 13:02:44.170926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f6b2c9d03'
+down_revision: Union[str, Sequence[str], None] = '3c9e1d7a52b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_counters',
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('change_counters')
@@ -0,0 +1,35 @@
+"""Add password reset otps
+
+Revision ID: e7b1d5c3a820
+Revises: 8c4e2a9f7d16
+Create Date: 2026-10-17 15:58:04.912376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b1d5c3a820'
+down_revision: Union[str, Sequence[str], None] = '8c4e2a9f7d16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('password_reset_otps',
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('otp', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('email')
+    )
+    op.create_index(op.f('ix_password_reset_otps_expires_at'), 'password_reset_otps', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_password_reset_otps_expires_at'), table_name='password_reset_otps')
+    op.drop_table('password_reset_otps')
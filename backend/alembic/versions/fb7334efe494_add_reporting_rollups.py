@@ -0,0 +1,44 @@
+"""Add reporting rollups
+
+Revision ID: fb7334efe494
+Revises: 7fe5ddcae60f
+Create Date: 2026-10-17 12:05:31.418275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fb7334efe494'
+down_revision: Union[str, Sequence[str], None] = '7fe5ddcae60f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('booking_daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('appointment_type_id', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'CONFIRMED', 'CANCELLED', 'COMPLETED', name='bookingstatus', create_type=False), nullable=False),
+    sa.Column('booking_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'appointment_type_id', 'status')
+    )
+    op.create_table('revenue_daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('appointment_type_id', sa.Integer(), nullable=False),
+    sa.Column('currency', sa.String(), nullable=False),
+    sa.Column('payment_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'appointment_type_id', 'currency')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('revenue_daily_rollups')
+    op.drop_table('booking_daily_rollups')
@@ -1,80 +1,128 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta, time
-from typing import List
-from app.database import get_db
+from datetime import datetime, time, timedelta
+from typing import List, Optional
+from app.core.metrics import BOOKINGS_CREATED, SLOT_FULL_REJECTIONS
+from app.database import get_async_db, get_db
 from app.models.models import Booking, AppointmentType, Slot, BookingStatus, User, UserRole, ResourceAssignmentType
-from app.schemas.appointment import SlotOut, BookingCreate, BookingOut, BookingListOut
+from app.schemas.appointment import SlotOut, DayAvailabilityOut, BookingCreate, BookingOut, BookingListOut
 from app.schemas.service import ServiceCreate, ServiceOut, ServiceUpdate
+from app.services.appointment_queries import (
+    appointment_dict,
+    appointment_rows_query,
+    calendar_events_query,
+    encode_cursor,
+    newest_first_page,
+    status_counts,
+    status_counts_query,
+    status_total,
+)
+from app.services.catalog import (
+    CATALOG_SCOPES,
+    cached_catalog,
+    load_service,
+    service_out,
+    service_rows_query,
+    store_catalog,
+)
+from app.services.export import stream_csv, stream_ndjson
+from app.services.availability import (
+    MAX_RANGE_DAYS,
+    SLOT_CAPACITY,
+    SLOT_MINUTES,
+    get_day_availability,
+    get_range_availability,
+    uses_materialized_slots,
+)
+from app.services.reporting import move_booking_status, record_booking
+from app.services.reservations import lock_grid_slot, reclaim_booking, release_booking, reserve_slot
+from app.services.versioning import (
+    CUSTOMERS,
+    SERVICES,
+    SLOTS,
+    current_versions,
+    customer_scope,
+    not_modified,
+    slots_scope,
+)
 
 
 router = APIRouter()
 
 
 @router.get("/slots", response_model=List[SlotOut])
-def get_slots(
+async def get_slots(
+    request: Request,
+    response: Response,
     date_str: str = Query(..., alias="date", description="Date in YYYY-MM-DD format"),
     appointment_type_id: int = Query(..., description="ID of the appointment type"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get available slots for a given date and appointment type.
-    Slots are 30 mins long. Capacity is 3 per slot.
+    Slots are 30 mins long. Capacity is 3 per slot. Bookings for the whole
+    day are counted in one grouped query, skipped entirely with a 304 when
+    the type's ETag still matches.
     """
-    print(f"Request for slots: date={date_str}, type={appointment_type_id}")
-
     try:
         target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-    appt_type = (
-        db.query(AppointmentType)
-        .filter(AppointmentType.id == appointment_type_id)
-        .first()
-    )
+    versions = await current_versions(db, SLOTS, slots_scope(appointment_type_id))
+    cached = not_modified(request, response, versions)
+    if cached:
+        return cached
+
+    appt_type = await db.get(AppointmentType, appointment_type_id)
     if not appt_type:
         # If appointment type doesn't exist, return empty list to avoid downstream errors
         return []
 
-    start_work = datetime.combine(target_date, time(9, 0))
-    end_work = datetime.combine(target_date, time(17, 0))
-    slot_duration = timedelta(minutes=30)
-
-    slots_response: List[SlotOut] = []
-    current_time = start_work
-    slot_id_counter = 1
+    return await db.run_sync(get_day_availability, appointment_type_id, target_date)
 
-    while current_time < end_work:
-        slot_end = current_time + slot_duration
 
-        booking_count = (
-            db.query(Booking)
-            .filter(
-                Booking.appointment_type_id == appointment_type_id,
-                Booking.start_time == current_time,
-                Booking.status != BookingStatus.CANCELLED,
-            )
-            .count()
-        )
+@router.get("/slots/range", response_model=List[DayAvailabilityOut])
+async def get_slots_range(
+    request: Request,
+    response: Response,
+    start_date_str: str = Query(..., alias="start_date", description="First date in YYYY-MM-DD format"),
+    end_date_str: str = Query(..., alias="end_date", description="Last date (inclusive) in YYYY-MM-DD format"),
+    appointment_type_id: int = Query(..., description="ID of the appointment type"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get available slots for every date in a range, grouped by date.
+    Used by month views so the whole calendar costs one request.
+    """
+    try:
+        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-        max_capacity = 3
-        available = booking_count < max_capacity
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
 
-        slots_response.append(
-            SlotOut(
-                id=slot_id_counter,
-                start_time=current_time,
-                end_time=slot_end,
-                current_bookings_count=booking_count,
-                is_available=available,
-            )
+    if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days",
         )
 
-        current_time += slot_duration
-        slot_id_counter += 1
+    versions = await current_versions(db, SLOTS, slots_scope(appointment_type_id))
+    cached = not_modified(request, response, versions)
+    if cached:
+        return cached
+
+    appt_type = await db.get(AppointmentType, appointment_type_id)
+    if not appt_type:
+        return []
 
-    return slots_response
+    return await db.run_sync(get_range_availability, appointment_type_id, start_date, end_date)
 
 
 @router.post("/bookings", response_model=BookingOut)
@@ -98,34 +146,56 @@ def create_booking(
         db.commit()
         db.refresh(customer)
 
-    # Calculate end time (30 min slots)
-    end_time = booking_data.start_time + timedelta(minutes=30)
+    if uses_materialized_slots(db, booking_data.appointment_type_id):
+        # Check and take capacity of every covered slot in one conditional UPDATE
+        slot = reserve_slot(db, booking_data.appointment_type_id, booking_data.start_time)
+        if not slot:
+            SLOT_FULL_REJECTIONS.labels("materialized").inc()
+            raise HTTPException(status_code=400, detail="This slot is fully booked")
+
+        new_booking = Booking(
+            customer_id=customer.id,
+            appointment_type_id=booking_data.appointment_type_id,
+            resource_id=slot.resource_id,
+            slot_id=slot.id,
+            start_time=slot.start_time,
+            end_time=slot.end_time,
+            status=BookingStatus.CONFIRMED,
+        )
+    else:
+        # Calculate end time (30 min slots)
+        end_time = booking_data.start_time + timedelta(minutes=SLOT_MINUTES)
 
-    # Check capacity
-    current_count = (
-        db.query(Booking)
-        .filter(
-            Booking.appointment_type_id == booking_data.appointment_type_id,
-            Booking.start_time == booking_data.start_time,
-            Booking.status != BookingStatus.CANCELLED,
+        # Check capacity, holding the slot's lock until the booking is committed
+        lock_grid_slot(db, booking_data.appointment_type_id, booking_data.start_time)
+        current_count = (
+            db.query(Booking)
+            .filter(
+                Booking.appointment_type_id == booking_data.appointment_type_id,
+                Booking.start_time == booking_data.start_time,
+                Booking.status != BookingStatus.CANCELLED,
+            )
+            .count()
         )
-        .count()
-    )
 
-    if current_count >= 3:
-        raise HTTPException(status_code=400, detail="This slot is fully booked")
+        if current_count >= SLOT_CAPACITY:
+            SLOT_FULL_REJECTIONS.labels("grid").inc()
+            raise HTTPException(status_code=400, detail="This slot is fully booked")
+
+        new_booking = Booking(
+            customer_id=customer.id,
+            appointment_type_id=booking_data.appointment_type_id,
+            start_time=booking_data.start_time,
+            end_time=end_time,
+            status=BookingStatus.CONFIRMED,
+        )
 
     # Create booking
-    new_booking = Booking(
-        customer_id=customer.id,
-        appointment_type_id=booking_data.appointment_type_id,
-        start_time=booking_data.start_time,
-        end_time=end_time,
-        status=BookingStatus.CONFIRMED,
-    )
     db.add(new_booking)
+    record_booking(db, new_booking.start_time, new_booking.appointment_type_id, new_booking.status)
     db.commit()
     db.refresh(new_booking)
+    BOOKINGS_CREATED.inc()
 
     return BookingOut(
         id=new_booking.id,
@@ -138,142 +208,221 @@ def create_booking(
 
 
 @router.get("/bookings", response_model=List[BookingListOut])
-def get_bookings(
+async def get_bookings(
+    request: Request,
+    response: Response,
     customer_email: str = Query(..., description="Customer email to fetch bookings for"),
-    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: str = Query(None, description="X-Next-Cursor from the previous page"),
+    updated_since: datetime = Query(None, description="Only bookings changed after this time (ISO 8601)"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Get all bookings for a customer by email.
+    Get a customer's bookings by email, newest first, in one joined query.
+    Answers 304 when If-None-Match still matches the customer's ETag.
+    When more pages exist the X-Next-Cursor header carries the cursor for the
+    next one. Clients can resync with updated_since set to the latest
+    updated_at they have seen.
     """
-    # Find customer
-    customer = db.query(User).filter(User.email == customer_email).first()
-    if not customer:
+    customer_id = await db.scalar(select(User.id).where(User.email == customer_email))
+    if customer_id is None:
         return []
 
-    # Get bookings
-    bookings = (
-        db.query(Booking)
-        .filter(Booking.customer_id == customer.id)
-        .order_by(Booking.start_time.desc())
-        .all()
-    )
-
-    result: List[BookingListOut] = []
-    for booking in bookings:
-        appt_type = (
-            db.query(AppointmentType)
-            .filter(AppointmentType.id == booking.appointment_type_id)
-            .first()
+    versions = await current_versions(db, SERVICES, CUSTOMERS, customer_scope(customer_id))
+    cached = not_modified(request, response, versions)
+    if cached:
+        return cached
+
+    query = (
+        select(
+            Booking.id,
+            Booking.start_time,
+            Booking.end_time,
+            Booking.status,
+            Booking.created_at,
+            Booking.updated_at,
+            AppointmentType.name.label("service_name"),
         )
+        .select_from(Booking)
+        .outerjoin(AppointmentType, AppointmentType.id == Booking.appointment_type_id)
+        .where(Booking.customer_id == customer_id)
+    )
+    if updated_since:
+        query = query.where(Booking.updated_at > updated_since)
 
-        result.append(
-            BookingListOut(
-                id=booking.id,
-                service_name=appt_type.name if appt_type else "Unknown Service",
-                start_time=booking.start_time,
-                end_time=booking.end_time,
-                status=booking.status.value,
-                created_at=None,  # Booking model doesn't have created_at
-            )
+    try:
+        page_query = newest_first_page(query, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = (await db.execute(page_query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].start_time, rows[-1].id)
+
+    return [
+        BookingListOut(
+            id=row.id,
+            service_name=row.service_name or "Unknown Service",
+            start_time=row.start_time,
+            end_time=row.end_time,
+            status=row.status.value,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
         )
-
-    return result
+        for row in rows
+    ]
 
 
 # ============== ADMIN APPOINTMENTS ENDPOINTS ==============
 
 @router.get("/admin/appointments")
-def get_admin_appointments(
+async def get_admin_appointments(
     status: str = Query(None, description="Filter by status"),
     date_from: str = Query(None, description="Filter from date (YYYY-MM-DD)"),
     date_to: str = Query(None, description="Filter to date (YYYY-MM-DD)"),
     search: str = Query(None, description="Search by customer name or email"),
-    limit: int = Query(100, description="Limit results"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000, description="Limit results"),
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    include_counts: bool = Query(True, description="Include total and per-status counts"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Get all appointments for admin dashboard with filtering.
+    Get appointments for admin dashboard with filtering, newest first.
+    Pages are keyset-paginated on (start_time, id); pass next_cursor back to
+    get the following page. Later pages can skip the counts with
+    include_counts=false.
     """
-    query = db.query(Booking)
-
-    # Filter by status
-    if status:
-        status_map = {
-            "pending": BookingStatus.PENDING,
-            "confirmed": BookingStatus.CONFIRMED,
-            "cancelled": BookingStatus.CANCELLED,
-            "completed": BookingStatus.COMPLETED,
-        }
-        if status in status_map:
-            query = query.filter(Booking.status == status_map[status])
-
-    # Filter by date range
-    if date_from:
-        try:
-            from_date = datetime.strptime(date_from, "%Y-%m-%d")
-            query = query.filter(Booking.start_time >= from_date)
-        except ValueError:
-            pass
+    query = appointment_rows_query(status, date_from, date_to, search)
 
-    if date_to:
-        try:
-            to_date = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)
-            query = query.filter(Booking.start_time < to_date)
-        except ValueError:
-            pass
-
-    # Get all bookings first for search filtering and counts
-    all_bookings = query.order_by(Booking.start_time.desc()).all()
+    try:
+        page_query = newest_first_page(query, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    # Build response with customer info
-    appointments = []
-    for booking in all_bookings:
-        customer = db.query(User).filter(User.id == booking.customer_id).first()
-        appt_type = db.query(AppointmentType).filter(
-            AppointmentType.id == booking.appointment_type_id
-        ).first()
+    rows = (await db.execute(page_query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
-        customer_name = customer.full_name if customer else "Unknown"
-        customer_email = customer.email if customer else "unknown@email.com"
-        service_name = appt_type.name if appt_type else "Unknown Service"
+    response = {
+        "appointments": [appointment_dict(row) for row in rows],
+        "next_cursor": encode_cursor(rows[-1].start_time, rows[-1].id) if has_more else None,
+    }
 
-        # Search filter
+    if include_counts:
+        # Counts ignore the search term, like the dashboard cards expect
+        count_rows = (await db.execute(status_counts_query(status, date_from, date_to))).all()
         if search:
-            search_lower = search.lower()
-            if search_lower not in customer_name.lower() and search_lower not in customer_email.lower():
-                continue
-
-        appointments.append({
-            "id": booking.id,
-            "customer_name": customer_name,
-            "customer_email": customer_email,
-            "service_name": service_name,
-            "start_time": booking.start_time.isoformat(),
-            "end_time": booking.end_time.isoformat(),
-            "status": booking.status.value,
-            "created_at": None,
-        })
-
-    # Apply limit
-    limited_appointments = appointments[:limit]
-
-    # Calculate counts from all (non-search-filtered) bookings
-    all_statuses = [b.status for b in all_bookings]
-    pending_count = sum(1 for s in all_statuses if s == BookingStatus.PENDING)
-    confirmed_count = sum(1 for s in all_statuses if s == BookingStatus.CONFIRMED)
-    cancelled_count = sum(1 for s in all_statuses if s == BookingStatus.CANCELLED)
-    completed_count = sum(1 for s in all_statuses if s == BookingStatus.COMPLETED)
+            response["total"] = await db.scalar(select(func.count()).select_from(query.subquery()))
+        else:
+            response["total"] = status_total(count_rows)
+        response.update(status_counts(count_rows))
+
+    return response
+
+
+@router.get("/admin/appointments/summary")
+async def get_admin_appointments_summary(
+    status: str = Query(None, description="Filter by status"),
+    date_from: str = Query(None, description="Filter from date (YYYY-MM-DD)"),
+    date_to: str = Query(None, description="Filter to date (YYYY-MM-DD)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Appointment counts per status for the dashboard cards, from one
+    GROUP BY status aggregate.
+    """
+    count_rows = (await db.execute(status_counts_query(status, date_from, date_to))).all()
+    return {"total": status_total(count_rows), **status_counts(count_rows)}
+
+
+@router.get("/calendar/feed")
+async def get_calendar_feed(
+    start_str: str = Query(..., alias="start", description="First visible date in YYYY-MM-DD format"),
+    end_str: str = Query(..., alias="end", description="Last visible date (inclusive) in YYYY-MM-DD format"),
+    resource_id: Optional[int] = Query(None, description="Only bookings assigned to this resource"),
+    organiser_id: Optional[int] = Query(None, description="Only services owned by this organiser"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Compact events for the calendar's visible window. Service and customer
+    names are sent once in side dictionaries keyed by id.
+    """
+    try:
+        start_date = datetime.strptime(start_str, "%Y-%m-%d").date()
+        end_date = datetime.strptime(end_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+
+    if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days")
+
+    window_start = datetime.combine(start_date, time.min)
+    window_end = datetime.combine(end_date + timedelta(days=1), time.min)
+    rows = (await db.execute(
+        calendar_events_query(window_start, window_end, resource_id, organiser_id)
+    )).all()
+
+    service_ids = {row.appointment_type_id for row in rows}
+    customer_ids = {row.customer_id for row in rows}
+    services = {}
+    if service_ids:
+        services = dict((await db.execute(
+            select(AppointmentType.id, AppointmentType.name).where(AppointmentType.id.in_(service_ids))
+        )).all())
+    customers = {}
+    if customer_ids:
+        customers = dict((await db.execute(
+            select(User.id, User.full_name).where(User.id.in_(customer_ids))
+        )).all())
 
     return {
-        "appointments": limited_appointments,
-        "total": len(appointments),
-        "pending_count": pending_count,
-        "confirmed_count": confirmed_count,
-        "cancelled_count": cancelled_count,
-        "completed_count": completed_count,
+        "events": [
+            {
+                "id": row.id,
+                "start": row.start_time.isoformat(),
+                "end": row.end_time.isoformat(),
+                "resource_id": row.resource_id,
+                "status": row.status.value if row.status else None,
+                "service_id": row.appointment_type_id,
+                "customer_id": row.customer_id,
+            }
+            for row in rows
+        ],
+        "services": services,
+        "customers": customers,
     }
 
 
+@router.get("/admin/appointments/export")
+def export_admin_appointments(
+    status: str = Query(None, description="Filter by status"),
+    date_from: str = Query(None, description="Filter from date (YYYY-MM-DD)"),
+    date_to: str = Query(None, description="Filter to date (YYYY-MM-DD)"),
+    search: str = Query(None, description="Search by customer name or email"),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+):
+    """
+    Stream every matching appointment as CSV or NDJSON, oldest first.
+    Takes the same filters as the admin list.
+    """
+    query = appointment_rows_query(status, date_from, date_to, search)
+
+    if export_format == "ndjson":
+        body, media_type = stream_ndjson(query), "application/x-ndjson"
+    else:
+        body, media_type = stream_csv(query), "text/csv"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=appointments.{export_format}"},
+    )
+
+
 @router.put("/admin/appointments/{appointment_id}/status")
 def update_appointment_status(
     appointment_id: int,
@@ -298,7 +447,21 @@ def update_appointment_status(
     if new_status not in status_map:
         raise HTTPException(status_code=400, detail="Invalid status")
 
+    old_status = booking.status
+    was_cancelled = old_status == BookingStatus.CANCELLED
     booking.status = status_map[new_status]
+
+    # Keep the slot counter in step with cancellations
+    if booking.slot_id is not None:
+        is_cancelled = booking.status == BookingStatus.CANCELLED
+        if is_cancelled and not was_cancelled:
+            release_booking(db, booking)
+        elif was_cancelled and not is_cancelled:
+            if not reclaim_booking(db, booking):
+                db.rollback()
+                raise HTTPException(status_code=400, detail="This slot is fully booked")
+
+    move_booking_status(db, booking.start_time, booking.appointment_type_id, old_status, booking.status)
     db.commit()
     db.refresh(booking)
 
@@ -317,6 +480,10 @@ def delete_appointment(
     if not booking:
         raise HTTPException(status_code=404, detail="Appointment not found")
 
+    if booking.status != BookingStatus.CANCELLED:
+        release_booking(db, booking)
+
+    record_booking(db, booking.start_time, booking.appointment_type_id, booking.status, -1)
     db.delete(booking)
     db.commit()
 
@@ -326,36 +493,28 @@ def delete_appointment(
 # ============== SERVICE ENDPOINTS ==============
 
 @router.get("/services", response_model=List[ServiceOut])
-def get_services(
+async def get_services(
+    request: Request,
+    response: Response,
     published_only: bool = Query(True, description="Only return published services"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all services (appointment types). By default returns only published ones.
+    Built from one joined query, cached until a service or booking changes,
+    and answered with 304 while the client's ETag is current.
     """
-    query = db.query(AppointmentType)
-    if published_only:
-        query = query.filter(AppointmentType.is_published == True)
-    
-    services = query.all()
-    result = []
-    for service in services:
-        owner = db.query(User).filter(User.id == service.owner_id).first() if service.owner_id else None
-        booking_count = db.query(Booking).filter(
-            Booking.appointment_type_id == service.id
-        ).count()
-        result.append(ServiceOut(
-            id=service.id,
-            name=service.name,
-            description=service.description,
-            duration_minutes=service.duration_minutes,
-            price=service.price,
-            is_published=service.is_published,
-            owner_id=service.owner_id,
-            provider_name=owner.full_name if owner else "UrbanCare",
-            booking_count=booking_count
-        ))
-    return result
+    versions = await current_versions(db, *CATALOG_SCOPES)
+    cached = not_modified(request, response, versions)
+    if cached:
+        return cached
+
+    services = cached_catalog(published_only, versions)
+    if services is None:
+        rows = (await db.execute(service_rows_query(published_only))).all()
+        services = [service_out(row) for row in rows]
+        store_catalog(published_only, versions, services)
+    return services
 
 
 @router.post("/services", response_model=ServiceOut)
@@ -427,24 +586,8 @@ def update_service(
         service.price = service_data.price
     
     db.commit()
-    db.refresh(service)
-    
-    owner = db.query(User).filter(User.id == service.owner_id).first() if service.owner_id else None
-    booking_count = db.query(Booking).filter(
-        Booking.appointment_type_id == service.id
-    ).count()
-    
-    return ServiceOut(
-        id=service.id,
-        name=service.name,
-        description=service.description,
-        duration_minutes=service.duration_minutes,
-        price=service.price,
-        is_published=service.is_published,
-        owner_id=service.owner_id,
-        provider_name=owner.full_name if owner else "UrbanCare",
-        booking_count=booking_count
-    )
+
+    return load_service(db, service.id)
 
 
 @router.delete("/services/{service_id}")
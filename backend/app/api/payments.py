@@ -1,9 +1,17 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from app.database import get_db
+from app.core.metrics import PAYMENTS_INITIATED, PAYMENTS_SUCCEEDED
+from app.database import get_async_db, get_db
+from app.services.reporting import record_payment
+from app.services.versioning import customer_scope, mark_changed
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
@@ -27,9 +35,9 @@ def _calc_tax(price: int) -> int:
 
 # --------- APIs ---------
 @router.get("/checkout")
-def get_checkout_details(
+async def get_checkout_details(
     booking_id: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Returns price + service + customer details for a booking.
@@ -38,7 +46,7 @@ def get_checkout_details(
       bookings -> appointment_types
       appointment_types.name -> services.name (case-insensitive)
     """
-    row = db.execute(
+    row = (await db.execute(
         text("""
             SELECT
                 b.id AS booking_id,
@@ -53,7 +61,7 @@ def get_checkout_details(
             WHERE b.id = :booking_id
         """),
         {"booking_id": booking_id},
-    ).mappings().first()
+    )).mappings().first()
 
     if not row:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -120,10 +128,11 @@ def init_payment(payload: PaymentInitIn, db: Session = Depends(get_db)):
         ).mappings().first()
 
         db.commit()
+        PAYMENTS_INITIATED.inc()
         return dict(row)
     except Exception as e:
         db.rollback()
-        print(f"PAYMENT INIT ERROR: {e}")  # Checking actual error
+        logger.exception("Payment init failed for booking %s", payload.booking_id)
         raise HTTPException(status_code=400, detail=f"Payment init failed: {e}")
 
 
@@ -134,42 +143,57 @@ def mark_payment_success(payload: PaymentSuccessIn, db: Session = Depends(get_db
     Your bookings.payment_status column is TEXT, so we store 'paid'.
     """
     try:
+        # Flip the status in one statement so that of two concurrent callbacks
+        # only the one that changed the row records revenue
         p = db.execute(
-            text("SELECT id, booking_id FROM payments WHERE id = :pid"),
-            {"pid": payload.payment_id},
-        ).mappings().first()
-
-        if not p:
-            raise HTTPException(status_code=404, detail="Payment not found")
-
-        # update payment
-        db.execute(
             text("""
-                UPDATE payments
+                UPDATE payments p
                 SET status = 'PAID',
                     updated_at = NOW()
-                WHERE id = :pid
+                FROM bookings b
+                WHERE p.id = :pid
+                  AND b.id = p.booking_id
+                  AND p.status IS DISTINCT FROM 'PAID'
+                RETURNING p.booking_id, p.amount, p.currency, p.updated_at, b.appointment_type_id, b.customer_id
             """),
             {"pid": payload.payment_id},
-        )
+        ).mappings().first()
+
+        if not p:
+            db.rollback()
+            booking_id = db.execute(
+                text("SELECT booking_id FROM payments WHERE id = :pid"),
+                {"pid": payload.payment_id},
+            ).scalar()
+            if booking_id is None:
+                raise HTTPException(status_code=404, detail="Payment not found")
+            # Already paid: a repeated callback changes nothing
+            return {"ok": True, "payment_id": payload.payment_id, "booking_id": booking_id}
+
+        # Same day as the rebuild's DATE(updated_at), on the database's clock
+        paid_on = p["updated_at"].date()
+        record_payment(db, paid_on, p["appointment_type_id"], p["amount"] or 0, p["currency"] or "INR")
 
         # update booking payment_status (enum column)
         db.execute(
             text("""
                 UPDATE bookings
-                SET payment_status = 'PAID'::paymentstatus
+                SET payment_status = 'PAID'::paymentstatus,
+                    updated_at = NOW()
                 WHERE id = :bid
             """),
             {"bid": p["booking_id"]},
         )
+        mark_changed(db, customer_scope(p["customer_id"]))
 
         db.commit()
+        PAYMENTS_SUCCEEDED.inc()
         return {"ok": True, "payment_id": payload.payment_id, "booking_id": p["booking_id"]}
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
-        print(f"PAYMENT SUCCESS ERROR: {e}")
+        logger.exception("Payment success failed for payment %s", payload.payment_id)
         raise HTTPException(status_code=400, detail=f"Payment success failed: {e}")
 
 
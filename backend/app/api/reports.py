@@ -0,0 +1,135 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.models import AppointmentType, BookingDailyRollup, RevenueDailyRollup
+from app.services.appointment_queries import status_counts
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+def _day_range(model, date_from: Optional[date], date_to: Optional[date]):
+    if date_from and date_to and date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    conditions = []
+    if date_from:
+        conditions.append(model.day >= date_from)
+    if date_to:
+        conditions.append(model.day <= date_to)
+    return conditions
+
+
+@router.get("/bookings")
+async def get_booking_report(
+    date_from: Optional[date] = Query(None, description="First appointment day (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Last appointment day (YYYY-MM-DD)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Booking totals per status, per service and per day, read from the daily
+    rollups only.
+    """
+    in_range = _day_range(BookingDailyRollup, date_from, date_to)
+
+    counts = status_counts(
+        (await db.execute(
+            select(BookingDailyRollup.status, func.sum(BookingDailyRollup.booking_count))
+            .where(*in_range)
+            .group_by(BookingDailyRollup.status)
+        )).all()
+    )
+
+    services = (await db.execute(
+        select(
+            AppointmentType.id,
+            AppointmentType.name,
+            func.coalesce(func.sum(BookingDailyRollup.booking_count), 0).label("booking_count"),
+        )
+        .outerjoin(
+            BookingDailyRollup,
+            and_(BookingDailyRollup.appointment_type_id == AppointmentType.id, *in_range),
+        )
+        .group_by(AppointmentType.id, AppointmentType.name)
+        .order_by(AppointmentType.id)
+    )).all()
+
+    daily = (await db.execute(
+        select(BookingDailyRollup.day, func.sum(BookingDailyRollup.booking_count))
+        .where(*in_range)
+        .group_by(BookingDailyRollup.day)
+        .order_by(BookingDailyRollup.day)
+    )).all()
+
+    return {
+        "total": sum(counts.values()),
+        **counts,
+        "services": [
+            {"id": row.id, "name": row.name, "booking_count": int(row.booking_count)}
+            for row in services
+        ],
+        "daily": [{"day": day, "booking_count": int(count)} for day, count in daily],
+    }
+
+
+@router.get("/revenue")
+async def get_revenue_report(
+    date_from: Optional[date] = Query(None, description="First payment day (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Last payment day (YYYY-MM-DD)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Paid revenue per service and per day, read from the daily rollups only.
+    """
+    in_range = _day_range(RevenueDailyRollup, date_from, date_to)
+
+    services = (await db.execute(
+        select(
+            RevenueDailyRollup.appointment_type_id,
+            AppointmentType.name,
+            RevenueDailyRollup.currency,
+            func.sum(RevenueDailyRollup.payment_count).label("payment_count"),
+            func.sum(RevenueDailyRollup.revenue).label("revenue"),
+        )
+        .outerjoin(AppointmentType, AppointmentType.id == RevenueDailyRollup.appointment_type_id)
+        .where(*in_range)
+        .group_by(RevenueDailyRollup.appointment_type_id, AppointmentType.name, RevenueDailyRollup.currency)
+        .order_by(RevenueDailyRollup.appointment_type_id)
+    )).all()
+
+    daily = (await db.execute(
+        select(
+            RevenueDailyRollup.day,
+            RevenueDailyRollup.currency,
+            func.sum(RevenueDailyRollup.payment_count).label("payment_count"),
+            func.sum(RevenueDailyRollup.revenue).label("revenue"),
+        )
+        .where(*in_range)
+        .group_by(RevenueDailyRollup.day, RevenueDailyRollup.currency)
+        .order_by(RevenueDailyRollup.day)
+    )).all()
+
+    return {
+        "services": [
+            {
+                "id": row.appointment_type_id,
+                "name": row.name or "Unknown Service",
+                "currency": row.currency,
+                "payment_count": int(row.payment_count),
+                "revenue": int(row.revenue),
+            }
+            for row in services
+        ],
+        "daily": [
+            {
+                "day": row.day,
+                "currency": row.currency,
+                "payment_count": int(row.payment_count),
+                "revenue": int(row.revenue),
+            }
+            for row in daily
+        ],
+    }
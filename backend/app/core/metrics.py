@@ -0,0 +1,138 @@
+"""
+Prometheus metrics served at /metrics.
+
+With several workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory
+shared by the workers (cleared on every deploy, before they start); each
+worker then writes its samples there and a scrape of any one worker returns
+the totals across all of them. Without it, /metrics reports only the worker
+that answers the scrape.
+
+The in-flight and checked-out gauges sum only workers that have not been
+marked dead with mark_worker_dead. Workers mark themselves on a clean
+shutdown; to also cover workers that crash or are killed, run under gunicorn,
+whose child_exit hook in gunicorn.conf.py marks every exited worker:
+
+    gunicorn -k uvicorn.workers.UvicornWorker -w 4 app.main:app
+
+Under `uvicorn --workers` a killed worker's last values stay in the sums
+until the directory is cleared on the next deploy.
+"""
+import os
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (seconds) of the request latency buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# =====================
+# HTTP
+# =====================
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being served",
+    multiprocess_mode="livesum",
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(seconds)
+
+
+# =====================
+# DATABASE POOL
+# =====================
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts", "Pool checkouts", ["pool"])
+DB_POOL_CONNECTS = Counter("db_pool_connects", "New database connections opened", ["pool"])
+DB_POOL_OVERFLOWS = Counter("db_pool_overflow_connects", "Connections opened beyond pool_size", ["pool"])
+DB_POOL_INVALIDATIONS = Counter("db_pool_invalidations", "Connections invalidated", ["pool"])
+DB_POOL_TIMEOUTS = Counter("db_pool_timeouts", "Checkouts that gave up waiting", ["pool"])
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+
+def observe_pool_wait(pool: str, seconds: float, timed_out: bool = False) -> None:
+    DB_POOL_WAIT.labels(pool).observe(seconds)
+    if timed_out:
+        DB_POOL_TIMEOUTS.labels(pool).inc()
+
+
+def instrument_pool(engine: Engine, pool: str) -> None:
+    checked_out = DB_POOL_CHECKED_OUT.labels(pool)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTS.labels(pool).inc()
+        if hasattr(engine.pool, "overflow") and engine.pool.overflow() > 0:
+            DB_POOL_OVERFLOWS.labels(pool).inc()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.labels(pool).inc()
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        DB_POOL_INVALIDATIONS.labels(pool).inc()
+
+
+# =====================
+# BOOKINGS AND PAYMENTS
+# =====================
+
+BOOKINGS_CREATED = Counter("bookings_created", "Bookings created")
+SLOT_FULL_REJECTIONS = Counter(
+    "booking_slot_full_rejections",
+    "Bookings refused because the slot was full",
+    ["mode"],  # "materialized" slots or the fixed "grid"
+)
+PAYMENTS_INITIATED = Counter("payments_initiated", "Payments initiated")
+PAYMENTS_SUCCEEDED = Counter("payments_succeeded", "Payments marked as paid")
+
+
+# =====================
+# EXPOSITION
+# =====================
+
+def mark_worker_dead(pid: int) -> None:
+    """
+    Drop a stopped worker's live gauges from the multiprocess sums.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,63 @@
+"""
+Password hashing on a dedicated process pool. bcrypt is CPU-bound and holds
+the GIL, so a login burst run in the request threadpool would starve every
+other endpoint; here it queues for PASSWORD_HASH_WORKERS processes instead,
+and handlers await it without holding a thread.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
+
+# Hashes made at another cost factor report needs_update and are rehashed
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    try:
+        return pwd_context.verify_and_update(password, hashed)
+    except ValueError:
+        # Not a hash at all: guest and Google accounts have no password
+        return False, None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned, not forked: the app process already runs threads
+        _executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), _hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Returns (matches, new_hash); new_hash is set when the stored hash should
+    be replaced, e.g. after BCRYPT_ROUNDS changed.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), _verify_and_update, password, hashed
+    )
+
+
+def shutdown_password_hasher() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
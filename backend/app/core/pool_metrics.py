@@ -0,0 +1,104 @@
+"""
+Connection pool stats for /api/admin/db-pool. The pool events are counted
+once, by the Prometheus metrics in app.core.metrics; snapshots read this
+worker's values back from those metrics.
+"""
+import time
+from typing import Dict, Optional, Type
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from app.core.metrics import (
+    DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUTS, DB_POOL_CONNECTS, DB_POOL_INVALIDATIONS,
+    DB_POOL_OVERFLOWS, DB_POOL_TIMEOUTS, DB_POOL_WAIT, instrument_pool, observe_pool_wait,
+)
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        observe_pool_wait(self.name, seconds, timed_out)
+
+    def _samples(self) -> Dict[tuple, float]:
+        samples = {}
+        for metric in (
+            DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUTS, DB_POOL_CONNECTS, DB_POOL_INVALIDATIONS,
+            DB_POOL_OVERFLOWS, DB_POOL_TIMEOUTS, DB_POOL_WAIT,
+        ):
+            for family in metric.collect():
+                for sample in family.samples:
+                    if sample.labels.get("pool") == self.name:
+                        samples[(sample.name, sample.labels.get("le"))] = sample.value
+        return samples
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        samples = self._samples()
+        value = lambda name: int(samples.get((name, None), 0))
+
+        # Prometheus buckets are cumulative; report each bucket's own count
+        buckets = {}
+        below = 0
+        for (name, le), count in sorted(
+            ((key, count) for key, count in samples.items() if key[0] == "db_pool_wait_seconds_bucket"),
+            key=lambda item: float(item[0][1]),
+        ):
+            bound = "+Inf" if le == "+Inf" else f"{float(le) * 1000:g}"
+            buckets[bound] = int(count - below)
+            below = count
+
+        return {
+            "name": self.name,
+            "pool_class": type(pool).__name__ if pool is not None else None,
+            "pool_size": pool.size() if hasattr(pool, "size") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "checked_out": value("db_pool_checked_out_connections"),
+            "checkouts": value("db_pool_checkouts_total"),
+            "connects": value("db_pool_connects_total"),
+            "overflow_events": value("db_pool_overflow_connects_total"),
+            "invalidations": value("db_pool_invalidations_total"),
+            "timeouts": value("db_pool_timeouts_total"),
+            "wait_ms": {
+                "count": value("db_pool_wait_seconds_count"),
+                "sum": round(samples.get(("db_pool_wait_seconds_sum", None), 0.0) * 1000, 3),
+                "buckets": buckets,
+            },
+        }
+
+
+POOLS: Dict[str, PoolMetrics] = {}
+
+
+def timed_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclass of `base` that times how long callers wait for a connection.
+    Pools have no "before checkout" event, so the wait is measured around
+    _do_get. The class survives engine.dispose(), which recreates the pool
+    from its own class.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except Exception as e:
+            metrics.observe_wait(time.perf_counter() - started, timed_out=isinstance(e, exc.TimeoutError))
+            raise
+        metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    metrics.engine = engine
+    POOLS[metrics.name] = metrics
+    instrument_pool(engine, metrics.name)
+
+
+def snapshot_all() -> Dict[str, dict]:
+    return {name: metrics.snapshot() for name, metrics in POOLS.items()}
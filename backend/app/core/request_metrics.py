@@ -0,0 +1,168 @@
+"""
+Per-request timing: wall time, database time, statement count and rows
+returned, collected from cursor events and reported as a Server-Timing
+header, one JSON log line and the Prometheus latency histogram per request.
+"""
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import N_PLUS_ONE_THRESHOLD, REQUEST_LOG_ENABLED
+from app.core.metrics import REQUESTS_IN_FLIGHT, observe_request
+
+logger = logging.getLogger("app.requests")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_QUERY_STARTED_KEY = "request_metrics_started"
+
+
+class RequestStats:
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope or {}
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+        self.statements: Counter = Counter()
+
+    def repeated_statement(self) -> Optional[tuple]:
+        """
+        The most repeated statement if it ran often enough to look like one
+        query per result row (N+1), as (statement, count).
+        """
+        if not self.statements:
+            return None
+        statement, count = self.statements.most_common(1)[0]
+        return (statement, count) if count >= N_PLUS_ONE_THRESHOLD else None
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def current_route() -> Optional[str]:
+    """
+    "METHOD /route/template" of the request being served, if any.
+    """
+    stats = _current.get()
+    if stats is None or "method" not in stats.scope:
+        return None
+    route = getattr(stats.scope.get("route"), "path", None) or stats.scope["path"]
+    return f"{stats.scope['method']} {route}"
+
+
+# =====================
+# CURSOR EVENTS
+# =====================
+
+def instrument_queries(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault(_QUERY_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        started = conn.info.get(_QUERY_STARTED_KEY)
+        if stats is None or not started:
+            return
+        stats.db_seconds += time.perf_counter() - started.pop()
+        stats.queries += 1
+        stats.statements[statement] += 1
+        # Drivers that cannot count a SELECT's rows up front (SQLite) report -1
+        if cursor.description is not None and cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        started = exception_context.connection.info.get(_QUERY_STARTED_KEY) if exception_context.connection else None
+        if started:
+            started.pop()
+
+
+# =====================
+# MIDDLEWARE
+# =====================
+
+def server_timing(stats: RequestStats, wall_ms: float) -> str:
+    db_ms = stats.db_seconds * 1000
+    return (
+        f'app;dur={wall_ms:.1f}, '
+        f'db;dur={db_ms:.1f};desc="{stats.queries} queries, {stats.rows} rows"'
+    )
+
+
+class RequestTimingMiddleware:
+    """
+    Pure ASGI middleware, so it adds no task or body buffering per request.
+    Statements run in the threadpool for sync endpoints see the same stats
+    object: Starlette copies the context into worker threads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        status = [500]
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                wall_ms = (time.perf_counter() - stats.started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(stats, wall_ms).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            REQUESTS_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            observe_request(scope["method"], route, status[0], time.perf_counter() - stats.started)
+            if REQUEST_LOG_ENABLED:
+                log_request(scope, status[0], stats)
+
+
+def log_request(scope, status: int, stats: RequestStats) -> None:
+    route = scope.get("route")
+    entry = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": getattr(route, "path", None),
+        "status": status,
+        "wall_ms": round((time.perf_counter() - stats.started) * 1000, 2),
+        "db_ms": round(stats.db_seconds * 1000, 2),
+        "queries": stats.queries,
+        "rows": stats.rows,
+    }
+    repeated = stats.repeated_statement()
+    if repeated:
+        statement, count = repeated
+        entry["n_plus_one"] = {"statement": " ".join(statement.split())[:200], "count": count}
+        logger.warning(json.dumps(entry))
+    else:
+        logger.info(json.dumps(entry))
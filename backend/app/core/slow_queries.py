@@ -0,0 +1,183 @@
+"""
+Slow-query log. Statements slower than SLOW_QUERY_MS are logged with their
+bound parameters (secrets masked) and originating route, and kept in a bounded in-memory ring
+for /api/admin/slow-queries. On PostgreSQL an EXPLAIN plan (without ANALYZE,
+so nothing runs twice) is captured on a background thread and attached to the
+entry once ready.
+"""
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import SLOW_QUERY_EXPLAIN, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_MS
+from app.core.request_metrics import current_route
+
+logger = logging.getLogger("app.slow_queries")
+
+_QUERY_STARTED_KEY = "slow_query_started"
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+# Plans waiting beyond this are skipped rather than queued behind a slow database
+_MAX_PENDING_EXPLAINS = 20
+_MAX_PARAM_CHARS = 200
+_SECRET_PARAM = re.compile(r"password|secret|token|otp", re.IGNORECASE)
+# Every value in these tables is sensitive: OTP digests, and mail bodies carrying codes
+_SECRET_TABLES = re.compile(r"\b(email_outbox|password_reset_otps)\b", re.IGNORECASE)
+
+_ring: deque = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_ring_lock = threading.Lock()
+_ids = itertools.count(1)
+_explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+_explain_slots = threading.BoundedSemaphore(_MAX_PENDING_EXPLAINS)
+
+
+def _param_repr(value) -> str:
+    text = repr(value)
+    return text if len(text) <= _MAX_PARAM_CHARS else text[:_MAX_PARAM_CHARS] + "..."
+
+
+def _printable_parameters(statement: str, parameters, context):
+    """
+    Parameters for the log, with secrets masked by the name of the bind
+    parameter (the column for inserts and updates). Positional parameters
+    are named from the compiled statement, or all masked when it has none.
+    Statements touching _SECRET_TABLES keep no parameters at all.
+    """
+    if _SECRET_TABLES.search(statement):
+        return "***"
+    if getattr(context, "compiled", None) is not None and len(context.compiled_parameters) == 1:
+        parameters = context.compiled_parameters[0]
+    if isinstance(parameters, dict):
+        return {
+            key: "***" if _SECRET_PARAM.search(str(key)) else _param_repr(value)
+            for key, value in parameters.items()
+        }
+    if isinstance(parameters, (list, tuple)):
+        return ["***"] * len(parameters)
+    return _param_repr(parameters)
+
+
+def _as_pyformat(statement: str, parameters) -> tuple:
+    """
+    Rewrite an asyncpg ($1, $2) statement for psycopg2, which runs the EXPLAIN.
+    """
+    values = []
+
+    def placeholder(match):
+        values.append(parameters[int(match.group(1)) - 1])
+        return "%s"
+
+    statement = re.sub(r"\$(\d+)", placeholder, statement.replace("%", "%%"))
+    return statement, tuple(values)
+
+
+# =====================
+# RING
+# =====================
+
+def recent_slow_queries(limit: int = 50) -> List[dict]:
+    with _ring_lock:
+        entries = list(_ring)
+    return [dict(entry) for entry in reversed(entries[-limit:])]
+
+
+def clear_slow_queries() -> None:
+    with _ring_lock:
+        _ring.clear()
+
+
+def _record(statement: str, parameters, context, duration_ms: float, executemany: bool) -> dict:
+    entry = {
+        "id": next(_ids),
+        "at": datetime.now().isoformat(timespec="milliseconds"),
+        "duration_ms": round(duration_ms, 2),
+        "route": current_route(),
+        "statement": statement,
+        "parameters": (
+            f"{len(parameters)} parameter sets" if executemany else _printable_parameters(statement, parameters, context)
+        ),
+        "plan": None,
+    }
+    with _ring_lock:
+        _ring.append(entry)
+    logger.warning(json.dumps({key: value for key, value in entry.items() if key != "plan"}, default=str))
+    return entry
+
+
+# =====================
+# EXPLAIN
+# =====================
+
+def _explain(explain_engine: Engine, entry: dict, statement: str, parameters) -> None:
+    try:
+        with explain_engine.connect() as conn:
+            rows = conn.exec_driver_sql("EXPLAIN (ANALYZE off) " + statement, parameters)
+            entry["plan"] = [row[0] for row in rows]
+    except Exception as e:
+        entry["plan"] = [f"EXPLAIN failed: {e}"]
+    finally:
+        _explain_slots.release()
+
+
+def _queue_explain(explain_engine: Engine, paramstyle: str, entry: dict, statement: str, parameters) -> None:
+    if not _explain_slots.acquire(blocking=False):
+        entry["plan"] = ["EXPLAIN skipped: too many plans pending"]
+        return
+    if paramstyle == "numeric_dollar":
+        statement, parameters = _as_pyformat(statement, parameters)
+    _explainer.submit(_explain, explain_engine, entry, statement, parameters)
+
+
+# =====================
+# ENGINE EVENTS
+# =====================
+
+def instrument_slow_queries(engine: Engine, explain_engine: Optional[Engine] = None) -> None:
+    """
+    Watch `engine` for slow statements. Plans are captured through the sync
+    `explain_engine` (psycopg2), which also serves the async engine.
+    """
+    explain = (
+        SLOW_QUERY_EXPLAIN
+        and explain_engine is not None
+        and explain_engine.dialect.name == "postgresql"
+        and engine.dialect.name == "postgresql"
+    )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get(_QUERY_STARTED_KEY)
+        if not started:
+            return
+        duration_ms = (time.perf_counter() - started.pop()) * 1000
+        if duration_ms < SLOW_QUERY_MS or statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        entry = _record(statement, parameters, context, duration_ms, executemany)
+        if (
+            explain
+            and not executemany
+            and statement.lstrip().split(None, 1)[0].upper() in _EXPLAINABLE
+            # Plans print the values they filter on
+            and not _SECRET_TABLES.search(statement)
+        ):
+            _queue_explain(explain_engine, engine.dialect.paramstyle, entry, statement, parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        connection = exception_context.connection
+        started = connection.info.get(_QUERY_STARTED_KEY) if connection is not None else None
+        if started:
+            started.pop()
@@ -1,7 +1,17 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from app.core.config import (
+    DB_MAX_OVERFLOW, DB_PGBOUNCER, DB_POOL_PRE_PING, DB_POOL_RECYCLE,
+    DB_POOL_SIZE, DB_POOL_TIMEOUT,
+)
+from app.core.pool_metrics import PoolMetrics, instrument_engine, timed_pool_class
+from app.core.request_metrics import instrument_queries
+from app.core.slow_queries import instrument_slow_queries
 from app.models.models import Base
 import os
+import uuid
 
 # Get database URL from environment
 DATABASE_URL = os.getenv(
@@ -13,12 +23,84 @@ DATABASE_URL = os.getenv(
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg2://", 1)
 
-engine = create_engine(DATABASE_URL)
+
+def _async_url(url: str) -> str:
+    """Map a sync driver URL onto its async driver."""
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+
+
+def _engine_options(url: str, metrics: PoolMetrics, queue_pool) -> dict:
+    """Pool settings from the environment, with checkout waits timed."""
+    if url.startswith("sqlite"):
+        return {}
+
+    if DB_PGBOUNCER:
+        # PgBouncer owns pooling; every checkout opens a fresh client connection
+        options = {"poolclass": timed_pool_class(NullPool, metrics)}
+        if "+asyncpg" in url:
+            # Transaction pooling cannot keep server-side prepared statements
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        return options
+
+    return {
+        "poolclass": timed_pool_class(queue_pool, metrics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+sync_pool_metrics = PoolMetrics("sync")
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, sync_pool_metrics, QueuePool))
+instrument_engine(engine, sync_pool_metrics)
+instrument_queries(engine)
+instrument_slow_queries(engine, explain_engine=engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for I/O-bound endpoints; shares the database with `engine`
+async_pool_metrics = PoolMetrics("async")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_engine_options(ASYNC_DATABASE_URL, async_pool_metrics, AsyncAdaptedQueuePool),
+)
+instrument_engine(async_engine.sync_engine, async_pool_metrics)
+instrument_queries(async_engine.sync_engine)
+# Plans for async statements are captured through the sync engine
+instrument_slow_queries(async_engine.sync_engine, explain_engine=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Registers the session hooks that regenerate slots when schedules change
+import app.services.slot_materializer  # noqa: E402,F401
+# Registers the session hooks that bump change counters for ETags
+import app.services.versioning  # noqa: E402,F401
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
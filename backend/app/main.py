@@ -1,37 +1,63 @@
 import os
 import random
+from contextlib import asynccontextmanager
 from starlette.middleware.sessions import SessionMiddleware
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import datetime
 from dotenv import load_dotenv
 from app.api import payments
-from app.database import get_db, engine
-from app.models.models import User, UserRole, Booking, Resource, Base
-from app.api import appointments, auth, payments
+from app.core.config import OUTBOX_WORKER_ENABLED, SLOW_QUERY_LOG_SIZE
+from app.database import SessionLocal, async_engine, engine, get_async_db, get_db
+from app.core.metrics import mark_worker_dead, render_metrics
+from app.core.passwords import hash_password, shutdown_password_hasher, verify_password
+from app.core.pool_metrics import snapshot_all as pool_snapshot
+from app.core.slow_queries import clear_slow_queries, recent_slow_queries
+from app.core.request_metrics import RequestTimingMiddleware
+from app.models.models import User, UserRole, Booking, BookingStatus, Resource
+from app.api import appointments, auth, payments, reports
 from app.core.security import create_access_token
-from app.core.deps import get_current_user
-from passlib.context import CryptContext
-from app.services.email import send_otp_email
-
-RESET_OTP_STORE = {}
+from app.core.deps import get_current_user, require_admin
+from app.services.email import enqueue_otp_email
+from app.services.otp_store import OTPSweeper, get_otp_store
+from app.services.outbox import OutboxWorker, wake_outbox
+from app.services.reporting import forget_bookings
+from app.services.reservations import release_slots
+from app.services.search import user_search_clause
 
 load_dotenv()
 
-# =====================
-# CREATE DATABASE TABLES
-# =====================
-Base.metadata.create_all(bind=engine)
-
 # =====================
 # APP SETUP
 # =====================
 
-app = FastAPI(title="UrbanCare API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema changes go through Alembic; startup touches no database, so
+    # workers boot even while it is unreachable
+    outbox = OutboxWorker(SessionLocal) if OUTBOX_WORKER_ENABLED else None
+    if outbox:
+        outbox.start()
+    otp_sweeper = OTPSweeper(get_otp_store())
+    otp_sweeper.start()
+    yield
+    otp_sweeper.stop()
+    if outbox:
+        outbox.stop()
+    shutdown_password_hasher()
+    await async_engine.dispose()
+    engine.dispose()
+    mark_worker_dead(os.getpid())
+
+
+app = FastAPI(title="UrbanCare API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.add_middleware(
@@ -46,21 +73,13 @@ app.add_middleware(
     secret_key=os.getenv("SESSION_SECRET", "dev-session-secret"),
 )
 
+# Added last so it wraps the other middleware and times the whole request
+app.add_middleware(RequestTimingMiddleware)
+
 app.include_router(appointments.router, prefix="/api")
 app.include_router(auth.router)
 app.include_router(payments.router, prefix="/api")
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# =====================
-# HELPERS
-# =====================
-
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+app.include_router(reports.router, prefix="/api")
 
 # =====================
 # SCHEMAS
@@ -114,8 +133,8 @@ def root():
 
 # ---------- SIGN UP ----------
 @app.post("/api/users", response_model=UserResponse)
-def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == user_data.email).first():
+async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    if (await db.execute(select(User.id).where(User.email == user_data.email))).first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
     if len(user_data.password) < 6:
@@ -132,7 +151,7 @@ def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
 
     user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password(user_data.password),
         full_name=user_data.full_name,
         role=role_map.get(user_data.role, UserRole.CUSTOMER),
         is_active=True,
@@ -140,18 +159,26 @@ def create_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 # ---------- LOGIN ----------
 @app.post("/api/auth/login")
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(User).where(User.email == data.email))).scalar_one_or_none()
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not user or not verify_password(data.password, user.password_hash):
+    valid, new_hash = await verify_password(data.password, user.password_hash)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    if new_hash:
+        # Rehash at the current cost factor while the password is at hand
+        user.password_hash = new_hash
+        await db.commit()
+
     token = create_access_token(
         {
             "user_id": user.id,
@@ -175,8 +202,11 @@ def get_me(
 
 # ---------- USERS ----------
 @app.get("/api/users", response_model=list[UserResponse])
-def get_users(limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(User).limit(limit).all()
+def get_users(limit: int = 100, search: Optional[str] = None, db: Session = Depends(get_db)):
+    query = db.query(User)
+    if search:
+        query = query.filter(user_search_clause(search))
+    return query.limit(limit).all()
 
 @app.get("/api/users/{user_id}", response_model=UserResponse)
 def get_user(user_id: int, db: Session = Depends(get_db)):
@@ -219,8 +249,27 @@ def delete_user(user_id: int, force: bool = False, db: Session = Depends(get_db)
     if total_references > 0 and not force:
         raise HTTPException(status_code=400, detail=f"User has {booking_count} booking(s) and {resource_count} resource(s)")
 
-    # Delete bookings where user is customer
+    # Delete bookings where user is customer and give back the slot places they held
+    held_slots = {
+        (resource_id, start_time, end_time): count
+        for resource_id, start_time, end_time, count in db.query(
+            Booking.resource_id, Booking.start_time, Booking.end_time, func.count(Booking.id)
+        )
+        .filter(
+            Booking.customer_id == user_id,
+            Booking.slot_id.isnot(None),
+            Booking.status != BookingStatus.CANCELLED,
+        )
+        .group_by(Booking.resource_id, Booking.start_time, Booking.end_time)
+    }
+    forget_bookings(
+        db,
+        db.query(Booking.start_time, Booking.appointment_type_id, Booking.status)
+        .filter(Booking.customer_id == user_id)
+        .all(),
+    )
     db.query(Booking).filter(Booking.customer_id == user_id).delete()
+    release_slots(db, held_slots)
     
     # Unlink resources from this user (set user_id to NULL instead of deleting)
     db.query(Resource).filter(Resource.user_id == user_id).update({"user_id": None})
@@ -259,6 +308,34 @@ def get_stats(db: Session = Depends(get_db)):
     }
 
 
+# ---------- DB POOL ----------
+@app.get("/api/admin/db-pool", dependencies=[Depends(require_admin)])
+def get_db_pool_stats():
+    return pool_snapshot()
+
+
+# ---------- SLOW QUERIES ----------
+@app.get("/api/admin/slow-queries", dependencies=[Depends(require_admin)])
+def get_slow_queries(limit: int = Query(50, ge=1, le=SLOW_QUERY_LOG_SIZE)):
+    """
+    Most recent slow statements first, with parameters, route and plan.
+    """
+    return recent_slow_queries(limit)
+
+
+@app.delete("/api/admin/slow-queries", dependencies=[Depends(require_admin)])
+def delete_slow_queries():
+    clear_slow_queries()
+    return {"message": "Slow-query log cleared"}
+
+
+# ---------- PROMETHEUS ----------
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.post("/api/auth/forgot-password")
 def forgot_password(
     data: ForgotPasswordRequest,
@@ -269,31 +346,32 @@ def forgot_password(
         raise HTTPException(status_code=404, detail="User not found")
 
     otp = str(random.randint(100000, 999999))
-    RESET_OTP_STORE[data.email] = otp
+    get_otp_store().put(data.email, otp)
 
-    send_otp_email(data.email, otp)
+    enqueue_otp_email(db, data.email, otp)
+    db.commit()
+    wake_outbox()
 
     return {"message": "OTP sent to email"}
 
 
 @app.post("/api/auth/reset-password")
-def reset_password(
+async def reset_password(
     data: ResetPasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    if RESET_OTP_STORE.get(data.email) != data.otp:
-        raise HTTPException(status_code=400, detail="Invalid OTP")
-
     if len(data.new_password) < 8:
         raise HTTPException(status_code=400, detail="Password too short")
 
-    user = db.query(User).filter(User.email == data.email).first()
+    # Checking uses the code up, so it resets the password at most once
+    if not await run_in_threadpool(get_otp_store().consume, data.email, data.otp):
+        raise HTTPException(status_code=400, detail="Invalid OTP")
+
+    user = (await db.execute(select(User).where(User.email == data.email))).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.password_hash = pwd_context.hash(data.new_password)
-    db.commit()
-
-    RESET_OTP_STORE.pop(data.email, None)
+    user.password_hash = await hash_password(data.new_password)
+    await db.commit()
     return {"message": "Password reset successful"}
 
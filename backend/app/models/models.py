@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, ForeignKey, 
-    Text, Enum, Interval, Time
+    Text, Enum, Interval, Time, Index, Date, BigInteger, text, DDL, event
 )
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -9,6 +9,13 @@ import enum
 
 Base = declarative_base()
 
+# The users trigram indexes need pg_trgm; migrations create it too
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 # Enums
 class UserRole(enum.Enum):
     CUSTOMER = "customer"
@@ -39,10 +46,30 @@ class PaymentStatus(enum.Enum):
     PENDING = "pending"
     PAID = "paid"
     MREFUNDED = "refunded"
+
+class EmailStatus(enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
 # Models
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Substring search on names and emails (pg_trgm, PostgreSQL only)
+        Index(
+            "ix_users_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -141,6 +168,10 @@ class Slot(Base):
     is_available = Column(Boolean, default=True)
     current_bookings_count = Column(Integer, default=0)
 
+    __table_args__ = (
+        Index("ix_slots_resource_id_start_time", "resource_id", "start_time"),
+    )
+
     # Relationships
     resource = relationship("Resource", back_populates="slots")
     bookings = relationship("Booking", back_populates="slot")
@@ -161,6 +192,16 @@ class QuestionDefinition(Base):
 
 class Booking(Base):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # Capacity checks and availability only count live bookings
+        Index(
+            "ix_bookings_type_start_active",
+            "appointment_type_id", "start_time",
+            postgresql_where=text("status != 'CANCELLED'"),
+        ),
+        # A customer's bookings, newest first, in keyset order
+        Index("ix_bookings_customer_start_id", "customer_id", "start_time", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     customer_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -168,11 +209,13 @@ class Booking(Base):
     resource_id = Column(Integer, ForeignKey('resources.id'), nullable=True) # Assigned resource
     slot_id = Column(Integer, ForeignKey('slots.id'), nullable=True) # Specific slot
     
-    start_time = Column(DateTime, nullable=False)
+    start_time = Column(DateTime, nullable=False, index=True)
     end_time = Column(DateTime, nullable=False)
     
     status = Column(Enum(BookingStatus), default=BookingStatus.PENDING)
     payment_status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     customer = relationship("User", back_populates="bookings")
@@ -190,3 +233,80 @@ class BookingAnswer(Base):
     answer_text = Column(Text)
 
     booking = relationship("Booking", back_populates="answers")
+
+
+class BookingDailyRollup(Base):
+    """
+    Bookings per service, status and appointment day. Maintained incrementally
+    on booking writes so reports never scan the bookings table.
+    """
+    __tablename__ = 'booking_daily_rollups'
+
+    day = Column(Date, primary_key=True)
+    appointment_type_id = Column(Integer, primary_key=True)
+    status = Column(Enum(BookingStatus), primary_key=True)
+    booking_count = Column(Integer, nullable=False, default=0)
+
+
+class RevenueDailyRollup(Base):
+    """
+    Paid revenue per service, currency and payment day.
+    """
+    __tablename__ = 'revenue_daily_rollups'
+
+    day = Column(Date, primary_key=True)
+    appointment_type_id = Column(Integer, primary_key=True)
+    currency = Column(String, primary_key=True)
+    payment_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Integer, nullable=False, default=0)
+
+
+class ChangeCounter(Base):
+    """
+    Version stamp per cache scope, bumped by every transaction that changes
+    data in that scope. Used to build ETags without recomputing responses.
+    """
+    __tablename__ = 'change_counters'
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+class EmailOutbox(Base):
+    """
+    Emails queued by requests and sent by the outbox worker, so no request
+    waits on SMTP. Pending rows are retried with backoff until next_attempt_at.
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        # The worker's claim query: due pending messages, oldest first
+        Index(
+            'ix_email_outbox_due',
+            'next_attempt_at',
+            'id',
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True))
+
+
+class PasswordResetOTP(Base):
+    """
+    Pending password-reset codes, shared by every worker, stored as HMAC
+    digests. Expired rows are removed by the OTP sweeper.
+    """
+    __tablename__ = 'password_reset_otps'
+
+    email = Column(String, primary_key=True)
+    otp_hash = Column(String, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
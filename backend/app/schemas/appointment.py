@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from datetime import datetime, time
+from datetime import date, datetime, time
 from typing import List, Optional
 
 class SlotOut(BaseModel):
@@ -12,6 +12,10 @@ class SlotOut(BaseModel):
     class Config:
         from_attributes = True
 
+class DayAvailabilityOut(BaseModel):
+    date: date
+    slots: List[SlotOut]
+
 class AppointmentTypeOut(BaseModel):
     id: int
     name: str
@@ -45,6 +49,7 @@ class BookingListOut(BaseModel):
     end_time: datetime
     status: str
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,188 @@
+"""
+Shared query building for the admin appointment list and its companions.
+Filtering, search and paging all happen in SQL.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Select, func, select, tuple_
+
+from app.models.models import AppointmentType, Booking, BookingStatus, User
+from app.services.search import user_search_clause
+
+STATUS_MAP = {
+    "pending": BookingStatus.PENDING,
+    "confirmed": BookingStatus.CONFIRMED,
+    "cancelled": BookingStatus.CANCELLED,
+    "completed": BookingStatus.COMPLETED,
+}
+
+
+def _parse_day(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        # Invalid dates are ignored, as the dashboard has always done
+        return None
+
+
+def apply_booking_filters(
+    stmt: Select,
+    status: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> Select:
+    if status in STATUS_MAP:
+        stmt = stmt.where(Booking.status == STATUS_MAP[status])
+
+    from_date = _parse_day(date_from)
+    if from_date:
+        stmt = stmt.where(Booking.start_time >= from_date)
+
+    to_date = _parse_day(date_to)
+    if to_date:
+        stmt = stmt.where(Booking.start_time < to_date + timedelta(days=1))
+
+    return stmt
+
+
+def appointment_rows_query(
+    status: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    search: Optional[str] = None,
+) -> Select:
+    """
+    One joined query yielding everything an appointment row needs.
+    """
+    stmt = (
+        select(
+            Booking.id,
+            Booking.start_time,
+            Booking.end_time,
+            Booking.status,
+            User.full_name.label("customer_name"),
+            User.email.label("customer_email"),
+            AppointmentType.name.label("service_name"),
+        )
+        .select_from(Booking)
+        .outerjoin(User, User.id == Booking.customer_id)
+        .outerjoin(AppointmentType, AppointmentType.id == Booking.appointment_type_id)
+    )
+    stmt = apply_booking_filters(stmt, status, date_from, date_to)
+    if search:
+        stmt = stmt.where(user_search_clause(search))
+    return stmt
+
+
+def status_counts_query(
+    status: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> Select:
+    """
+    Bookings per status in one GROUP BY, honoring the same filters as the list.
+    """
+    stmt = select(Booking.status, func.count(Booking.id)).group_by(Booking.status)
+    return apply_booking_filters(stmt, status, date_from, date_to)
+
+
+def status_counts(rows) -> Dict[str, int]:
+    counts = {f"{name}_count": 0 for name in STATUS_MAP}
+    for booking_status, count in rows:
+        if booking_status is not None:
+            counts[f"{booking_status.value}_count"] = count
+    return counts
+
+
+def status_total(rows) -> int:
+    """
+    Every counted booking, including those without a status, which have no
+    per-status bucket.
+    """
+    return sum(count for _, count in rows)
+
+
+# =====================
+# CALENDAR FEED
+# =====================
+
+def calendar_events_query(
+    window_start: datetime,
+    window_end: datetime,
+    resource_id: Optional[int] = None,
+    organiser_id: Optional[int] = None,
+) -> Select:
+    """
+    Bookings starting inside [window_start, window_end), read off the
+    start_time index. Names are left to the caller's side dictionaries.
+    """
+    stmt = (
+        select(
+            Booking.id,
+            Booking.start_time,
+            Booking.end_time,
+            Booking.resource_id,
+            Booking.status,
+            Booking.appointment_type_id,
+            Booking.customer_id,
+        )
+        .where(Booking.start_time >= window_start, Booking.start_time < window_end)
+        .order_by(Booking.start_time, Booking.id)
+    )
+    if resource_id is not None:
+        stmt = stmt.where(Booking.resource_id == resource_id)
+    if organiser_id is not None:
+        stmt = stmt.join(AppointmentType, AppointmentType.id == Booking.appointment_type_id).where(
+            AppointmentType.owner_id == organiser_id
+        )
+    return stmt
+
+
+# =====================
+# KEYSET PAGINATION
+# =====================
+
+def encode_cursor(start_time: datetime, booking_id: int) -> str:
+    raw = json.dumps([start_time.isoformat(), booking_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Raises ValueError for anything that is not a cursor we issued.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_time, booking_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(start_time), int(booking_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def newest_first_page(stmt: Select, cursor: Optional[str], limit: int) -> Select:
+    """
+    Order by (start_time, id) descending and continue after `cursor`.
+    Fetches one extra row so the caller can tell whether another page exists.
+    """
+    if cursor:
+        start_time, booking_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Booking.start_time, Booking.id) < tuple_(start_time, booking_id))
+    return stmt.order_by(Booking.start_time.desc(), Booking.id.desc()).limit(limit + 1)
+
+
+def appointment_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "customer_name": row.customer_name or "Unknown",
+        "customer_email": row.customer_email or "unknown@email.com",
+        "service_name": row.service_name or "Unknown Service",
+        "start_time": row.start_time.isoformat(),
+        "end_time": row.end_time.isoformat(),
+        "status": row.status.value if row.status else None,
+        "created_at": None,
+    }
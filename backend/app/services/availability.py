@@ -0,0 +1,233 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.models import AppointmentType, AppointmentTypeResource, Booking, BookingStatus, Slot
+from app.schemas.appointment import DayAvailabilityOut, SlotOut
+
+# Working day grid used for appointment types without materialized slots
+WORK_START = time(9, 0)
+WORK_END = time(17, 0)
+SLOT_MINUTES = 30
+SLOT_CAPACITY = 3
+
+# Longest window served by a single range request
+MAX_RANGE_DAYS = 62
+
+
+def slot_length(duration_minutes: Optional[int]) -> timedelta:
+    """
+    How long one booking of an appointment type lasts.
+    """
+    return timedelta(minutes=duration_minutes or SLOT_MINUTES)
+
+
+def slots_by_start(slots: Iterable) -> Dict[datetime, object]:
+    """
+    Index one resource's slot rows by start time. When two share a start
+    (a slot closed by a grid change next to its replacement), the first
+    one listed wins.
+    """
+    by_start: Dict[datetime, object] = {}
+    for slot in slots:
+        by_start.setdefault(slot.start_time, slot)
+    return by_start
+
+
+def covering_run(by_start: Dict[datetime, object], start_time: datetime, length: timedelta) -> Optional[list]:
+    """
+    Back-to-back slots covering [start_time, start_time + length), or None
+    when the grid has a gap there.
+    """
+    end_time = start_time + length
+    run = []
+    cursor = start_time
+    while cursor < end_time:
+        slot = by_start.get(cursor)
+        if slot is None:
+            return None
+        run.append(slot)
+        cursor = slot.end_time
+    return run if cursor == end_time else None
+
+
+def count_bookings(
+    db: Session,
+    appointment_type_id: int,
+    window_start: datetime,
+    window_end: datetime,
+) -> Dict[datetime, int]:
+    """
+    Count non-cancelled bookings per start time inside [window_start, window_end)
+    with a single grouped query.
+    """
+    rows = (
+        db.query(Booking.start_time, func.count(Booking.id))
+        .filter(
+            Booking.appointment_type_id == appointment_type_id,
+            Booking.start_time >= window_start,
+            Booking.start_time < window_end,
+            Booking.status != BookingStatus.CANCELLED,
+        )
+        .group_by(Booking.start_time)
+        .all()
+    )
+    return {start_time: count for start_time, count in rows}
+
+
+def uses_materialized_slots(db: Session, appointment_type_id: int) -> bool:
+    """
+    Appointment types linked to resources book against pre-generated Slot rows;
+    unlinked ones keep using the fixed working-day grid.
+    """
+    return (
+        db.query(AppointmentTypeResource.resource_id)
+        .filter(AppointmentTypeResource.appointment_type_id == appointment_type_id)
+        .first()
+        is not None
+    )
+
+
+def load_materialized_slots(
+    db: Session,
+    appointment_type_id: int,
+    window_start: datetime,
+    window_end: datetime,
+) -> Dict[date, List[SlotOut]]:
+    """
+    Read Slot rows of the type's resources inside [window_start, window_end)
+    with one range scan. A start time is offered when the resource's slots
+    cover a whole appointment from there; it is open only if every covered
+    slot still has room, and shows the busiest of their counts. When several
+    resources offer the same start time, the least-booked open one is shown.
+    """
+    duration = db.query(AppointmentType.duration_minutes).filter(AppointmentType.id == appointment_type_id).scalar()
+    length = slot_length(duration)
+    rows = (
+        db.query(
+            Slot.id,
+            Slot.resource_id,
+            Slot.start_time,
+            Slot.end_time,
+            Slot.current_bookings_count,
+            Slot.is_available,
+        )
+        .join(AppointmentTypeResource, AppointmentTypeResource.resource_id == Slot.resource_id)
+        .filter(
+            AppointmentTypeResource.appointment_type_id == appointment_type_id,
+            Slot.start_time >= window_start,
+            Slot.start_time < window_end,
+        )
+        .order_by(Slot.resource_id, Slot.start_time, Slot.is_available.desc(), Slot.id)
+        .all()
+    )
+
+    by_resource: Dict[int, list] = {}
+    for row in rows:
+        by_resource.setdefault(row.resource_id, []).append(row)
+
+    best: Dict[datetime, SlotOut] = {}
+    for slots in by_resource.values():
+        by_start = slots_by_start(slots)
+        for start_time in by_start:
+            run = covering_run(by_start, start_time, length)
+            if run is None:
+                continue
+            candidate = SlotOut(
+                id=run[0].id,
+                start_time=start_time,
+                end_time=start_time + length,
+                current_bookings_count=max(slot.current_bookings_count or 0 for slot in run),
+                is_available=all(
+                    slot.is_available and (slot.current_bookings_count or 0) < SLOT_CAPACITY
+                    for slot in run
+                ),
+            )
+            shown = best.get(start_time)
+            if shown is None or (not shown.is_available, shown.current_bookings_count, shown.id) > (
+                not candidate.is_available, candidate.current_bookings_count, candidate.id
+            ):
+                best[start_time] = candidate
+
+    by_day: Dict[date, List[SlotOut]] = {}
+    for start_time in sorted(best):
+        by_day.setdefault(start_time.date(), []).append(best[start_time])
+    return by_day
+
+
+def build_day_slots(target_date: date, counts: Dict[datetime, int]) -> List[SlotOut]:
+    """
+    Lay the working day grid over pre-counted bookings.
+    """
+    slot_duration = timedelta(minutes=SLOT_MINUTES)
+    current_time = datetime.combine(target_date, WORK_START)
+    end_work = datetime.combine(target_date, WORK_END)
+
+    slots: List[SlotOut] = []
+    slot_id_counter = 1
+    while current_time < end_work:
+        booking_count = counts.get(current_time, 0)
+        slots.append(
+            SlotOut(
+                id=slot_id_counter,
+                start_time=current_time,
+                end_time=current_time + slot_duration,
+                current_bookings_count=booking_count,
+                is_available=booking_count < SLOT_CAPACITY,
+            )
+        )
+        current_time += slot_duration
+        slot_id_counter += 1
+
+    return slots
+
+
+def get_day_availability(
+    db: Session,
+    appointment_type_id: int,
+    target_date: date,
+) -> List[SlotOut]:
+    """
+    Availability for one day. The query count does not depend on how many
+    slots the day holds.
+    """
+    window_start = datetime.combine(target_date, time.min)
+    window_end = datetime.combine(target_date + timedelta(days=1), time.min)
+
+    if uses_materialized_slots(db, appointment_type_id):
+        slots = load_materialized_slots(db, appointment_type_id, window_start, window_end)
+        return slots.get(target_date, [])
+
+    counts = count_bookings(db, appointment_type_id, window_start, window_end)
+    return build_day_slots(target_date, counts)
+
+
+def get_range_availability(
+    db: Session,
+    appointment_type_id: int,
+    start_date: date,
+    end_date: date,
+) -> List[DayAvailabilityOut]:
+    """
+    Availability for every day in [start_date, end_date], grouped by date.
+    All days share one scan over the whole window.
+    """
+    window_start = datetime.combine(start_date, time.min)
+    window_end = datetime.combine(end_date + timedelta(days=1), time.min)
+
+    if uses_materialized_slots(db, appointment_type_id):
+        materialized = load_materialized_slots(db, appointment_type_id, window_start, window_end)
+        day_slots = lambda day: materialized.get(day, [])
+    else:
+        counts = count_bookings(db, appointment_type_id, window_start, window_end)
+        day_slots = lambda day: build_day_slots(day, counts)
+
+    days: List[DayAvailabilityOut] = []
+    current_date = start_date
+    while current_date <= end_date:
+        days.append(DayAvailabilityOut(date=current_date, slots=day_slots(current_date)))
+        current_date += timedelta(days=1)
+
+    return days
@@ -0,0 +1,396 @@
+"""
+Bulk ingest of users, resources, services, schedules and bookings from CSV or
+JSON. PostgreSQL loads go through COPY; other databases fall back to
+executemany inserts. Foreign keys are given by natural key (user email,
+resource name, service name) and resolved with one query per batch, so no
+row is ever refreshed individually.
+"""
+import csv
+import io
+import json
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import Boolean, Date, DateTime, Enum, Integer, Time, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    AppointmentType, AppointmentTypeResource, Booking, BookingStatus,
+    Resource, Schedule, Slot, User,
+)
+from app.services.reporting import add_bookings
+from app.services.reservations import occupy_slots
+from app.services.slot_materializer import materialize_resource
+from app.services.versioning import BOOKINGS, CUSTOMERS, SERVICES, SLOTS, mark_changed
+
+BATCH_SIZE = 5000
+
+# Dependency order for bundles holding several entities
+LOAD_ORDER = ("users", "resources", "services", "schedules", "bookings")
+
+_COPY_NULL = "\\N"
+
+
+# =====================
+# READING
+# =====================
+
+def read_records(path) -> Iterator[dict]:
+    """
+    Records from a .csv, .json (list of objects) or .jsonl/.ndjson file.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    elif suffix in (".jsonl", ".ndjson"):
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif suffix == ".json":
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError(f"{path} must hold a list of records; use read_bundle for entity maps")
+        yield from data
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix}")
+
+
+def read_bundle(path) -> Dict[str, list]:
+    """
+    A JSON file of the form {"users": [...], "services": [...], ...}.
+    """
+    with Path(path).open(encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} is not a bundle; name the file after its entity or pass the entity")
+    unknown = set(data) - set(LOAD_ORDER)
+    if unknown:
+        raise ValueError(f"Unknown entities in bundle: {', '.join(sorted(unknown))}")
+    return data
+
+
+def _batches(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# =====================
+# VALUES
+# =====================
+
+def _coerce(column, value):
+    """
+    Turn a CSV/JSON value into what the column expects.
+    """
+    if value is None or value == "":
+        return None
+    column_type = column.type
+    if isinstance(column_type, Enum) and column_type.enum_class is not None:
+        enum_class = column_type.enum_class
+        if isinstance(value, enum_class):
+            return value
+        text = str(value)
+        if text.upper() in enum_class.__members__:
+            return enum_class[text.upper()]
+        return enum_class(text.lower())
+    if isinstance(column_type, Boolean):
+        return value if isinstance(value, bool) else str(value).strip().lower() in ("1", "true", "t", "yes", "y")
+    if isinstance(column_type, Integer):
+        return int(value)
+    if isinstance(column_type, DateTime):
+        return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    if isinstance(column_type, Date):
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+    if isinstance(column_type, Time):
+        return value if isinstance(value, time) else time.fromisoformat(str(value))
+    return value
+
+
+def _row(model, record: dict, resolved: dict) -> dict:
+    """
+    A full insert row: plain columns from the record, foreign keys from
+    `resolved`, Python-side defaults for anything missing or blank. COPY skips ORM defaults,
+    so every column is filled explicitly.
+    """
+    row = {}
+    for column in model.__table__.columns:
+        # Ids come from the sequence and timestamps from the server
+        if (column.primary_key and column.name == "id") or column.server_default is not None:
+            continue
+        if column.name in resolved:
+            row[column.name] = resolved[column.name]
+        elif record.get(column.name) not in (None, ""):
+            row[column.name] = _coerce(column, record[column.name])
+        elif column.default is not None and column.default.is_scalar:
+            row[column.name] = column.default.arg
+        else:
+            row[column.name] = None
+    return row
+
+
+def _lookup(db: Session, key_column, values: Iterable, *columns) -> Dict:
+    """
+    {natural key: row} for every value, in one query. When a key is not
+    unique the newest row wins.
+    """
+    keys = {value for value in values if value not in (None, "")}
+    if not keys:
+        return {}
+    rows = db.execute(
+        select(key_column, *columns).where(key_column.in_(keys)).order_by(columns[0])
+    ).all()
+    return {row[0]: row for row in rows}
+
+
+def _resolve(lookup: Dict, key, what: str, required: bool = True):
+    if key in (None, ""):
+        if required:
+            raise ValueError(f"Missing {what}")
+        return None
+    try:
+        return lookup[key]
+    except KeyError:
+        raise ValueError(f"Unknown {what}: {key}") from None
+
+
+def _names(value) -> List[str]:
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        return [name.strip() for name in value.split(";") if name.strip()]
+    return list(value)
+
+
+# =====================
+# WRITING
+# =====================
+
+def _copy_value(value) -> str:
+    if value is None:
+        return _COPY_NULL
+    if hasattr(value, "name") and hasattr(value, "value"):
+        # Enum columns store member names
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def uses_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def write_rows(db: Session, model, rows: List[dict]) -> None:
+    """
+    Insert rows in the session's transaction, with COPY where available.
+    """
+    if not rows:
+        return
+    if not uses_copy(db):
+        db.execute(insert(model), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in columns])
+    buffer.seek(0)
+
+    dbapi_connection = db.connection().connection.driver_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {model.__tablename__} ({', '.join(columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+            buffer,
+        )
+
+
+# =====================
+# ENTITIES
+# =====================
+
+def _load_users(db: Session, batch: List[dict]) -> int:
+    rows = [_row(User, {"password_hash": "!", **record}, {}) for record in batch]
+    write_rows(db, User, rows)
+    return len(rows)
+
+
+def _load_resources(db: Session, batch: List[dict]) -> int:
+    users = _lookup(db, User.email, (r.get("user_email") for r in batch), User.id)
+    rows = [
+        _row(Resource, record, {
+            "user_id": getattr(_resolve(users, record.get("user_email"), "user email", required=False), "id", None),
+        })
+        for record in batch
+    ]
+    write_rows(db, Resource, rows)
+    mark_changed(db, SLOTS)
+    return len(rows)
+
+
+def _load_services(db: Session, batch: List[dict]) -> int:
+    owners = _lookup(db, User.email, (r.get("owner_email") for r in batch), User.id)
+    rows = [
+        _row(AppointmentType, record, {
+            "owner_id": getattr(_resolve(owners, record.get("owner_email"), "owner email", required=False), "id", None),
+        })
+        for record in batch
+    ]
+    write_rows(db, AppointmentType, rows)
+
+    # Resource links need the new service ids, fetched back by name
+    wanted = [(record["name"], _names(record.get("resource_names"))) for record in batch]
+    resource_names = {name for _, names in wanted for name in names}
+    if resource_names:
+        services = _lookup(db, AppointmentType.name, (name for name, _ in wanted), AppointmentType.id)
+        resources = _lookup(db, Resource.name, resource_names, Resource.id)
+        links = {
+            (services[service_name].id, _resolve(resources, resource_name, "resource name").id)
+            for service_name, names in wanted
+            for resource_name in names
+        }
+        write_rows(db, AppointmentTypeResource, [
+            {"appointment_type_id": service_id, "resource_id": resource_id}
+            for service_id, resource_id in sorted(links)
+        ])
+        # New links can change the resources' base slot length
+        db.info.setdefault("bulk_scheduled_resources", set()).update(resource_id for _, resource_id in links)
+    mark_changed(db, SERVICES, SLOTS)
+    return len(rows)
+
+
+def _load_schedules(db: Session, batch: List[dict]) -> int:
+    resources = _lookup(db, Resource.name, (r.get("resource_name") for r in batch), Resource.id)
+    rows = [
+        _row(Schedule, record, {"resource_id": _resolve(resources, record.get("resource_name"), "resource name").id})
+        for record in batch
+    ]
+    write_rows(db, Schedule, rows)
+    db.info.setdefault("bulk_scheduled_resources", set()).update(row["resource_id"] for row in rows)
+    mark_changed(db, SLOTS)
+    return len(rows)
+
+
+def _load_bookings(db: Session, batch: List[dict]) -> int:
+    customers = _lookup(db, User.email, (r.get("customer_email") for r in batch), User.id)
+    services = _lookup(
+        db, AppointmentType.name, (r.get("service_name") for r in batch),
+        AppointmentType.id, AppointmentType.duration_minutes,
+    )
+    resources = _lookup(db, Resource.name, (r.get("resource_name") for r in batch), Resource.id)
+
+    rows = []
+    for record in batch:
+        service = _resolve(services, record.get("service_name"), "service name")
+        resource = _resolve(resources, record.get("resource_name"), "resource name", required=False)
+        start_time = _coerce(Booking.__table__.c.start_time, record.get("start_time"))
+        if start_time is None:
+            raise ValueError("Missing booking start_time")
+        end_time = _coerce(Booking.__table__.c.end_time, record.get("end_time")) or (
+            start_time + timedelta(minutes=service.duration_minutes or 30)
+        )
+        rows.append(_row(Booking, record, {
+            "customer_id": _resolve(customers, record.get("customer_email"), "customer email").id,
+            "appointment_type_id": service.id,
+            "resource_id": resource.id if resource else None,
+            "slot_id": None,
+            "start_time": start_time,
+            "end_time": end_time,
+        }))
+
+    # Attach bookings to the first materialized slot they cover, if any
+    pairs = {(row["resource_id"], row["start_time"]) for row in rows if row["resource_id"] is not None}
+    if pairs:
+        slot_ids = {
+            (resource_id, start_time): slot_id
+            for slot_id, resource_id, start_time in db.execute(
+                select(Slot.id, Slot.resource_id, Slot.start_time)
+                .where(tuple_(Slot.resource_id, Slot.start_time).in_(pairs))
+            )
+        }
+        for row in rows:
+            row["slot_id"] = slot_ids.get((row["resource_id"], row["start_time"]))
+
+    write_rows(db, Booking, rows)
+    live = [row for row in rows if row["status"] != BookingStatus.CANCELLED]
+    occupy_slots(db, Counter(
+        (row["resource_id"], row["start_time"], row["end_time"])
+        for row in live
+        if row["slot_id"] is not None
+    ))
+    add_bookings(db, ((row["start_time"], row["appointment_type_id"], row["status"]) for row in rows))
+    mark_changed(db, BOOKINGS, SLOTS, CUSTOMERS)
+    return len(rows)
+
+
+_LOADERS: Dict[str, Callable[[Session, List[dict]], int]] = {
+    "users": _load_users,
+    "resources": _load_resources,
+    "services": _load_services,
+    "schedules": _load_schedules,
+    "bookings": _load_bookings,
+}
+
+
+def load_records(db: Session, entity: str, records: Iterable[dict], batch_size: int = BATCH_SIZE) -> int:
+    """
+    Load one entity's records, committing after every batch. New schedules
+    and service links regenerate their resources' slots once the load finishes.
+    Returns the number of rows inserted.
+    """
+    try:
+        loader = _LOADERS[entity]
+    except KeyError:
+        raise ValueError(f"Unknown entity: {entity}") from None
+
+    total = 0
+    for batch in _batches(records, batch_size):
+        total += loader(db, batch)
+        db.commit()
+
+    scheduled = db.info.pop("bulk_scheduled_resources", None)
+    if scheduled:
+        for resource_id in sorted(scheduled):
+            materialize_resource(db, resource_id)
+        db.commit()
+    return total
+
+
+def load_bundle(db: Session, bundle: Dict[str, list], batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """
+    Load several entities in dependency order, so later ones can refer to
+    earlier ones by natural key.
+    """
+    return {
+        entity: load_records(db, entity, bundle[entity], batch_size)
+        for entity in LOAD_ORDER
+        if entity in bundle
+    }
+
+
+def load_path(db: Session, path, entity: Optional[str] = None, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """
+    Load a single-entity file (entity given or taken from the file name,
+    e.g. users.csv) or a JSON bundle.
+    """
+    path = Path(path)
+    entity = entity or (path.stem if path.stem in _LOADERS else None)
+    if entity is None:
+        return load_bundle(db, read_bundle(path), batch_size)
+    return {entity: load_records(db, entity, read_records(path), batch_size)}
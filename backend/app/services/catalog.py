@@ -0,0 +1,102 @@
+"""
+Service catalog built from a single query, with a process-local cache of the
+response keyed on the catalog's change counters.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from app.models.models import AppointmentType, Booking, User
+from app.schemas.service import ServiceOut
+from app.services.versioning import ALL_TYPES_SLOTS, BOOKINGS, SERVICES, USERS
+
+# Change counters a catalog entry depends on; booking counts move with
+# ALL_TYPES_SLOTS for single bookings and BOOKINGS for bulk writes
+CATALOG_SCOPES = (SERVICES, USERS, BOOKINGS, ALL_TYPES_SLOTS)
+
+_lock = threading.Lock()
+_cache: Dict[bool, Tuple[tuple, List[ServiceOut]]] = {}
+
+
+# =====================
+# QUERY
+# =====================
+
+def service_rows_query(published_only: bool = False, service_id: Optional[int] = None) -> Select:
+    """
+    Services with their owner's name and booking count, joined in one statement.
+    """
+    booking_counts = (
+        select(Booking.appointment_type_id, func.count(Booking.id).label("booking_count"))
+        .group_by(Booking.appointment_type_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            AppointmentType.id,
+            AppointmentType.name,
+            AppointmentType.description,
+            AppointmentType.duration_minutes,
+            AppointmentType.price,
+            AppointmentType.is_published,
+            AppointmentType.owner_id,
+            User.full_name.label("provider_name"),
+            func.coalesce(booking_counts.c.booking_count, 0).label("booking_count"),
+        )
+        .outerjoin(User, User.id == AppointmentType.owner_id)
+        .outerjoin(booking_counts, booking_counts.c.appointment_type_id == AppointmentType.id)
+        .order_by(AppointmentType.id)
+    )
+    if published_only:
+        stmt = stmt.where(AppointmentType.is_published == True)
+    if service_id is not None:
+        stmt = stmt.where(AppointmentType.id == service_id)
+    return stmt
+
+
+def service_out(row) -> ServiceOut:
+    return ServiceOut(
+        id=row.id,
+        name=row.name,
+        description=row.description,
+        duration_minutes=row.duration_minutes,
+        price=row.price,
+        is_published=row.is_published,
+        owner_id=row.owner_id,
+        provider_name=row.provider_name or "UrbanCare",
+        booking_count=row.booking_count,
+    )
+
+
+def load_service(db: Session, service_id: int) -> Optional[ServiceOut]:
+    row = db.execute(service_rows_query(service_id=service_id)).first()
+    return service_out(row) if row else None
+
+
+# =====================
+# CACHE
+# =====================
+
+def _version_key(versions: Dict[str, int]) -> tuple:
+    return tuple(versions[scope] for scope in CATALOG_SCOPES)
+
+
+def cached_catalog(published_only: bool, versions: Dict[str, int]) -> Optional[List[ServiceOut]]:
+    """
+    The cached catalog if it was built at exactly these versions. Every worker
+    reads the counters from the database, so writes made anywhere invalidate it.
+    """
+    with _lock:
+        entry = _cache.get(published_only)
+    if entry and entry[0] == _version_key(versions):
+        return entry[1]
+    return None
+
+
+def store_catalog(published_only: bool, versions: Dict[str, int], services: List[ServiceOut]) -> None:
+    # The rows may be newer than `versions`, never older, so the next
+    # version bump still forces a rebuild
+    with _lock:
+        _cache[published_only] = (_version_key(versions), services)
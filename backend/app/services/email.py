@@ -1,17 +1,109 @@
+"""
+Outgoing email. Requests only queue messages in the outbox table; the outbox
+worker (app.services.outbox) sends them through SMTPSender.
+"""
 import smtplib
+import time
 from email.message import EmailMessage
-import os
+from typing import Optional
 
-def send_otp_email(to_email: str, otp: str):
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    EMAIL_FROM, SMTP_HOST, SMTP_PASSWORD, SMTP_PORT, SMTP_SECURITY,
+    SMTP_TIMEOUT, SMTP_USER,
+)
+from app.models.models import EmailOutbox
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, body: str) -> EmailOutbox:
+    """
+    Queue a message; it is sent once the caller's transaction commits.
+    """
+    message = EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(message)
+    return message
+
+
+def enqueue_otp_email(db: Session, to_email: str, otp: str) -> EmailOutbox:
+    return enqueue_email(db, to_email, "UrbanCare Password Reset OTP", f"Your OTP is: {otp}")
+
+
+def build_message(to_email: str, subject: str, body: str) -> EmailMessage:
     msg = EmailMessage()
-    msg["Subject"] = "UrbanCare Password Reset OTP"
-    msg["From"] = os.getenv("GMAIL_USER")
+    msg["Subject"] = subject
+    msg["From"] = EMAIL_FROM
     msg["To"] = to_email
-    msg.set_content(f"Your OTP is: {otp}")
-
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-        server.login(
-            os.getenv("GMAIL_USER"),
-            os.getenv("GMAIL_APP_PASSWORD"),
-        )
-        server.send_message(msg)
+    msg.set_content(body)
+    return msg
+
+
+class SMTPSender:
+    """
+    One SMTP connection, opened and authenticated on the first send and
+    reused for every message after it until closed or dropped by the server.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        security: str = SMTP_SECURITY,
+        user: str = SMTP_USER,
+        password: str = SMTP_PASSWORD,
+        timeout: float = SMTP_TIMEOUT,
+    ):
+        self.host = host
+        self.port = port
+        self.security = security
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.security == "ssl":
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                server.starttls()
+        try:
+            if self.user:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def send(self, message: EmailMessage) -> None:
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped an idle connection; reconnect once
+            self._server = None
+            self._server = self._connect()
+            self._server.send_message(message)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # The server answered; the connection is still usable
+            raise
+        except OSError:
+            self.close()
+            raise
+        self.last_used = time.monotonic()
+
+    def close_if_idle(self, idle_seconds: float) -> None:
+        if self._server is not None and time.monotonic() - self.last_used >= idle_seconds:
+            self.close()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
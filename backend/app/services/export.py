@@ -0,0 +1,57 @@
+"""
+Streaming appointment export. Rows come off a server-side cursor in
+batches and are written out as they arrive, so memory stays flat no matter
+how many bookings match.
+"""
+import csv
+import io
+import json
+from typing import Iterator
+
+from sqlalchemy import Select
+
+from app.database import SessionLocal
+from app.models.models import Booking
+from app.services.appointment_queries import appointment_dict
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = [
+    "id", "customer_name", "customer_email", "service_name",
+    "start_time", "end_time", "status",
+]
+
+
+def _rows(query: Select) -> Iterator[list]:
+    # The request's session is closed before the body streams, so the
+    # export holds its own for as long as the cursor is open
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            query.order_by(Booking.start_time, Booking.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            yield [appointment_dict(row) for row in partition]
+    finally:
+        db.close()
+
+
+def stream_csv(query: Select) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for batch in _rows(query):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(query: Select) -> Iterator[str]:
+    for batch in _rows(query):
+        yield "".join(
+            json.dumps({field: item[field] for field in EXPORT_FIELDS}) + "\n"
+            for item in batch
+        )
@@ -0,0 +1,160 @@
+"""
+Password-reset OTP stores. Codes expire after OTP_TTL_SECONDS; an OTPSweeper
+thread removes expired ones. OTP_STORE_BACKEND picks the store:
+
+- "database": a table shared by every worker, so the reset request may land
+  on a different process than the one that issued the code
+- "memory": a size-bounded dict, for a single worker
+
+Both keep only an HMAC of each code (keyed with OTP_HASH_KEY), and a code is
+checked and used up in one step, so it works once even when two resets race.
+"""
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import (
+    OTP_HASH_KEY, OTP_MEMORY_MAX_ENTRIES, OTP_STORE_BACKEND, OTP_SWEEP_SECONDS,
+    OTP_TTL_SECONDS,
+)
+from app.database import SessionLocal
+from app.models.models import PasswordResetOTP
+
+logger = logging.getLogger(__name__)
+
+
+def otp_digest(otp: str) -> str:
+    return hmac.new(OTP_HASH_KEY.encode(), otp.encode(), hashlib.sha256).hexdigest()
+
+
+class MemoryOTPStore:
+    def __init__(self, ttl_seconds: int = OTP_TTL_SECONDS, max_entries: int = OTP_MEMORY_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # email -> (otp digest, expires at on the monotonic clock), oldest first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def put(self, email: str, otp: str) -> None:
+        with self._lock:
+            self._entries.pop(email, None)
+            self._entries[email] = (otp_digest(otp), time.monotonic() + self.ttl_seconds)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def consume(self, email: str, otp: str) -> bool:
+        """
+        True, and the code is used up, when it matches and has not expired.
+        """
+        digest = otp_digest(otp)
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[1] <= time.monotonic() or not hmac.compare_digest(entry[0], digest):
+                return False
+            del self._entries[email]
+        return True
+
+    def sweep(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [email for email, (_, expires) in self._entries.items() if expires <= now]
+            for email in expired:
+                del self._entries[email]
+        return len(expired)
+
+
+class DatabaseOTPStore:
+    _UPSERT_INSERTS = {
+        "postgresql": postgresql.insert,
+        "sqlite": sqlite.insert,
+    }
+
+    def __init__(self, session_factory, ttl_seconds: int = OTP_TTL_SECONDS):
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def put(self, email: str, otp: str) -> None:
+        expires_at = self._now() + timedelta(seconds=self.ttl_seconds)
+        with self.session_factory() as db:
+            insert = self._UPSERT_INSERTS[db.get_bind().dialect.name]
+            stmt = insert(PasswordResetOTP).values(email=email, otp_hash=otp_digest(otp), expires_at=expires_at)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["email"],
+                set_={"otp_hash": stmt.excluded.otp_hash, "expires_at": stmt.excluded.expires_at},
+            ))
+            db.commit()
+
+    def consume(self, email: str, otp: str) -> bool:
+        """
+        True, and the code is used up, when it matches and has not expired.
+        Checking and deleting is one statement, so of two concurrent resets
+        with the same code only one succeeds.
+        """
+        with self.session_factory() as db:
+            consumed = db.execute(
+                delete(PasswordResetOTP)
+                .where(
+                    PasswordResetOTP.email == email,
+                    PasswordResetOTP.otp_hash == otp_digest(otp),
+                    PasswordResetOTP.expires_at > self._now(),
+                )
+                .returning(PasswordResetOTP.email)
+            ).scalar()
+            db.commit()
+        return consumed is not None
+
+    def sweep(self) -> int:
+        with self.session_factory() as db:
+            deleted = db.execute(delete(PasswordResetOTP).where(PasswordResetOTP.expires_at <= self._now()))
+            db.commit()
+        return deleted.rowcount
+
+
+@lru_cache(maxsize=None)
+def get_otp_store():
+    if OTP_STORE_BACKEND == "memory":
+        return MemoryOTPStore()
+    if OTP_STORE_BACKEND == "database":
+        return DatabaseOTPStore(SessionLocal)
+    raise ValueError(f"Unknown OTP_STORE_BACKEND: {OTP_STORE_BACKEND}")
+
+
+class OTPSweeper:
+    """
+    Background thread removing expired codes every OTP_SWEEP_SECONDS.
+    """
+
+    def __init__(self, store, interval: float = OTP_SWEEP_SECONDS):
+        self.store = store
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.run, name="otp-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.store.sweep()
+            except Exception:
+                logger.exception("Sweeping expired OTPs failed")
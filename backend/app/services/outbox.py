@@ -0,0 +1,187 @@
+"""
+Email outbox worker. Leases due messages in batches with
+FOR UPDATE SKIP LOCKED, so any number of workers (one per uvicorn process, or
+outbox_worker.py) can run side by side without sending a message twice, and
+sends each batch over one reused SMTP connection outside any transaction.
+Failed messages are retried with exponential backoff until
+OUTBOX_MAX_ATTEMPTS. Bodies are blanked once a message is sent or given up
+on, so reset codes are not kept.
+"""
+import logging
+import random
+import smtplib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    OUTBOX_BATCH_SIZE, OUTBOX_LEASE_SECONDS, OUTBOX_MAX_ATTEMPTS, OUTBOX_POLL_SECONDS,
+    OUTBOX_RETRY_BASE_SECONDS, OUTBOX_RETRY_MAX_SECONDS, SMTP_IDLE_SECONDS,
+)
+from app.models.models import EmailOutbox, EmailStatus
+from app.services.email import SMTPSender, build_message
+
+logger = logging.getLogger(__name__)
+
+# Set when a request queues mail, so the worker sends it without waiting a poll
+_wake = threading.Event()
+
+
+def wake_outbox() -> None:
+    _wake.set()
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS)
+    # Jitter so messages that failed together do not retry together
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def _is_connection_failure(error: Exception) -> bool:
+    """
+    True when the SMTP server could not be reached or logged in to, which
+    fails every message alike, rather than when it refused this message.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, smtplib.SMTPAuthenticationError)):
+        return True
+    return isinstance(error, OSError)
+
+
+def _is_permanent_failure(error: Exception) -> bool:
+    """
+    True when retrying cannot help: the recipient was refused, or the
+    message could not be built at all.
+    """
+    return isinstance(error, smtplib.SMTPRecipientsRefused) or not isinstance(error, (smtplib.SMTPException, OSError))
+
+
+def claim_due_batch(db: Session, limit: int = OUTBOX_BATCH_SIZE) -> List[dict]:
+    """
+    Lease up to `limit` due messages in one short transaction: their attempt
+    is counted and next_attempt_at pushed OUTBOX_LEASE_SECONDS ahead, so other
+    workers skip them while they are sent, and a worker that dies mid-batch
+    leaves them due again once the lease runs out.
+    """
+    batch = db.execute(
+        select(EmailOutbox)
+        .where(EmailOutbox.status == EmailStatus.PENDING, EmailOutbox.next_attempt_at <= func.now())
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    lease_until = datetime.now(timezone.utc) + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+    claimed = []
+    for message in batch:
+        message.attempts += 1
+        message.next_attempt_at = lease_until
+        claimed.append({
+            "id": message.id,
+            "to_email": message.to_email,
+            "subject": message.subject,
+            "body": message.body,
+            "attempts": message.attempts,
+        })
+    db.commit()
+    return claimed
+
+
+def _record_outcome(db: Session, message: dict, values: dict) -> None:
+    # A message whose lease ran out may have been claimed again meanwhile;
+    # only the latest attempt records its outcome
+    db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == message["id"], EmailOutbox.attempts == message["attempts"])
+        .values(**values)
+    )
+    db.commit()
+
+
+def send_due_batch(db: Session, sender: SMTPSender, limit: int = OUTBOX_BATCH_SIZE) -> int:
+    """
+    Claim up to `limit` due messages, send them with no transaction open and
+    commit each outcome on its own. Returns how many were attempted; after a
+    connection failure the rest of the batch is released to retry.
+    """
+    batch = claim_due_batch(db, limit)
+
+    attempted = 0
+    for message in batch:
+        attempted += 1
+        try:
+            sender.send(build_message(message["to_email"], message["subject"], message["body"]))
+        except Exception as e:
+            values = {"last_error": str(e)[:1000]}
+            if _is_permanent_failure(e) or message["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+                # Nothing will read the body again; do not keep codes around
+                values.update(status=EmailStatus.FAILED, body="")
+                logger.error("Giving up on email %s to %s: %s", message["id"], message["to_email"], e)
+            else:
+                values["next_attempt_at"] = datetime.now(timezone.utc) + retry_delay(message["attempts"])
+                logger.warning("Email %s failed (attempt %s), will retry: %s", message["id"], message["attempts"], e)
+            _record_outcome(db, message, values)
+            if _is_connection_failure(e):
+                # Leave the rest of the batch due for the next poll
+                for skipped in batch[attempted:]:
+                    _record_outcome(db, skipped, {
+                        "attempts": skipped["attempts"] - 1,
+                        "next_attempt_at": func.now(),
+                    })
+                break
+        else:
+            _record_outcome(db, message, {
+                "status": EmailStatus.SENT,
+                "sent_at": datetime.now(timezone.utc),
+                "last_error": None,
+                "body": "",
+            })
+
+    return attempted
+
+
+class OutboxWorker:
+    """
+    Background thread draining the outbox: sends batches back to back while
+    full ones keep coming, then waits for a wake-up or the poll interval.
+    """
+
+    def __init__(self, session_factory, sender: Optional[SMTPSender] = None):
+        self.session_factory = session_factory
+        self.sender = sender or SMTPSender()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.run, name="email-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stop.set()
+        _wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_once(self) -> int:
+        db = self.session_factory()
+        try:
+            return send_due_batch(db, self.sender)
+        except Exception:
+            logger.exception("Email outbox batch failed")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    def run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                _wake.clear()
+                if self.run_once() >= OUTBOX_BATCH_SIZE:
+                    continue
+                self.sender.close_if_idle(SMTP_IDLE_SECONDS)
+                _wake.wait(OUTBOX_POLL_SECONDS)
+        finally:
+            self.sender.close()
@@ -0,0 +1,158 @@
+"""
+Daily reporting rollups. Writers call the record_* helpers inside their own
+transaction; report endpoints read only the rollup tables.
+"""
+from collections import Counter
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.models import Booking, BookingDailyRollup, BookingStatus, RevenueDailyRollup
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def increment_row(db: Session, model, keys: dict, increments: dict) -> None:
+    """
+    Add `increments` to the row identified by `keys`, creating it if needed,
+    in a single INSERT ... ON CONFLICT DO UPDATE.
+    """
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        filters = [getattr(model, key) == value for key, value in keys.items()]
+        updated = db.execute(
+            update(model)
+            .where(*filters)
+            .values({col: getattr(model, col) + value for col, value in increments.items()})
+            .execution_options(synchronize_session=False)
+        )
+        if updated.rowcount == 0:
+            db.add(model(**keys, **increments))
+        return
+
+    stmt = insert(model).values(**keys, **increments)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={col: getattr(model, col) + getattr(stmt.excluded, col) for col in increments},
+    )
+    db.execute(stmt)
+
+
+def record_booking(
+    db: Session,
+    start_time,
+    appointment_type_id: int,
+    status: Optional[BookingStatus],
+    delta: int = 1,
+) -> None:
+    if status is None:
+        return
+    increment_row(
+        db,
+        BookingDailyRollup,
+        {"day": start_time.date(), "appointment_type_id": appointment_type_id, "status": status},
+        {"booking_count": delta},
+    )
+
+
+def move_booking_status(
+    db: Session,
+    start_time,
+    appointment_type_id: int,
+    old_status: Optional[BookingStatus],
+    new_status: Optional[BookingStatus],
+) -> None:
+    if old_status == new_status:
+        return
+    record_booking(db, start_time, appointment_type_id, old_status, -1)
+    record_booking(db, start_time, appointment_type_id, new_status, 1)
+
+
+def _adjust_bookings(db: Session, bookings: Iterable[Tuple], sign: int) -> None:
+    grouped = Counter(
+        (start_time.date(), appointment_type_id, status)
+        for start_time, appointment_type_id, status in bookings
+        if status is not None
+    )
+    for (day, appointment_type_id, status), count in grouped.items():
+        increment_row(
+            db,
+            BookingDailyRollup,
+            {"day": day, "appointment_type_id": appointment_type_id, "status": status},
+            {"booking_count": sign * count},
+        )
+
+
+def add_bookings(db: Session, bookings: Iterable[Tuple]) -> None:
+    """
+    Count (start_time, appointment_type_id, status) rows into the rollups,
+    for bulk inserts.
+    """
+    _adjust_bookings(db, bookings, 1)
+
+
+def forget_bookings(db: Session, bookings: Iterable[Tuple]) -> None:
+    """
+    Take (start_time, appointment_type_id, status) rows out of the rollups,
+    for bulk deletes.
+    """
+    _adjust_bookings(db, bookings, -1)
+
+
+def record_payment(
+    db: Session,
+    paid_on: date,
+    appointment_type_id: int,
+    amount: int,
+    currency: str,
+) -> None:
+    increment_row(
+        db,
+        RevenueDailyRollup,
+        {"day": paid_on, "appointment_type_id": appointment_type_id, "currency": currency},
+        {"payment_count": 1, "revenue": amount},
+    )
+
+
+def rebuild_rollups(db: Session) -> None:
+    """
+    Recompute both rollup tables from the base tables. Used to backfill
+    after deploying, or to repair drift.
+    """
+    db.execute(delete(BookingDailyRollup))
+    booking_rows = db.execute(
+        select(Booking.start_time, Booking.appointment_type_id, Booking.status)
+        .execution_options(yield_per=5000)
+    )
+    grouped = Counter(
+        (start_time.date(), appointment_type_id, status)
+        for start_time, appointment_type_id, status in booking_rows
+        if status is not None
+    )
+    db.add_all(
+        BookingDailyRollup(day=day, appointment_type_id=appointment_type_id, status=status, booking_count=count)
+        for (day, appointment_type_id, status), count in grouped.items()
+    )
+
+    db.execute(delete(RevenueDailyRollup))
+    revenue_rows = db.execute(
+        text("""
+            SELECT
+                DATE(COALESCE(p.updated_at, p.created_at)) AS day,
+                b.appointment_type_id,
+                p.currency,
+                COUNT(*) AS payment_count,
+                COALESCE(SUM(p.amount), 0) AS revenue
+            FROM payments p
+            JOIN bookings b ON b.id = p.booking_id
+            WHERE p.status = 'PAID'
+            GROUP BY 1, 2, 3
+        """)
+    ).mappings().all()
+    db.add_all(RevenueDailyRollup(**row) for row in revenue_rows)
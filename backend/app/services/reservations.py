@@ -0,0 +1,198 @@
+"""
+Capacity reservation for bookings. Capacity belongs to a resource's time:
+a booking takes a place in every base slot its appointment covers, all in
+a single conditional UPDATE, so concurrent bookings of any length cannot
+overbook and no table-level locks are taken. Each statement marks the
+slots scopes of the types sharing the slot's resource rather than the
+global SLOTS scope.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import case, text, update
+from sqlalchemy.orm import Session
+
+from app.models.models import AppointmentType, AppointmentTypeResource, Booking, Slot
+from app.services.availability import SLOT_CAPACITY, covering_run, slot_length, slots_by_start
+from app.services.versioning import mark_changed, resource_scopes
+
+# (resource_id, start_time, end_time) of the bookings behind a release or import
+BookedRange = Tuple[int, datetime, datetime]
+
+
+class ReservedSlot(NamedTuple):
+    id: int  # first slot of the run, stored as Booking.slot_id
+    resource_id: int
+    start_time: datetime
+    end_time: datetime
+
+
+def _claim_range(db: Session, resource_id: int, start_time: datetime, length: timedelta) -> Optional[int]:
+    slots = (
+        db.query(Slot.id, Slot.start_time, Slot.end_time)
+        .filter(
+            Slot.resource_id == resource_id,
+            Slot.start_time >= start_time,
+            Slot.start_time < start_time + length,
+        )
+        .order_by(Slot.start_time, Slot.is_available.desc(), Slot.id)
+        .all()
+    )
+    run = covering_run(slots_by_start(slots), start_time, length)
+    if run is None:
+        return None
+
+    slot_ids = [slot.id for slot in run]
+    claimed = db.execute(
+        update(Slot)
+        .where(
+            Slot.id.in_(slot_ids),
+            Slot.is_available == True,
+            Slot.current_bookings_count < SLOT_CAPACITY,
+        )
+        .values(
+            current_bookings_count=Slot.current_bookings_count + 1,
+            is_available=Slot.current_bookings_count + 1 < SLOT_CAPACITY,
+        )
+        .returning(Slot.id)
+        .execution_options(synchronize_session=False, change_scopes=())
+    ).scalars().all()
+    if len(claimed) < len(slot_ids):
+        # Part of the run was full; hand back what this statement took
+        _give_back(db, claimed)
+        return None
+
+    mark_changed(db, *resource_scopes(db, [resource_id]))
+    return slot_ids[0]
+
+
+def _give_back(db: Session, slot_ids) -> None:
+    if slot_ids:
+        db.execute(
+            update(Slot)
+            .where(Slot.id.in_(slot_ids))
+            .values(
+                current_bookings_count=Slot.current_bookings_count - 1,
+                is_available=True,
+            )
+            .execution_options(synchronize_session=False, change_scopes=())
+        )
+
+
+def reserve_slot(db: Session, appointment_type_id: int, start_time: datetime) -> Optional[ReservedSlot]:
+    """
+    Take one place for an appointment of the type starting at start_time, on
+    the least-booked of the type's resources that has room for the whole
+    appointment. Returns the reservation, or None when every resource is full.
+    """
+    duration = db.query(AppointmentType.duration_minutes).filter(AppointmentType.id == appointment_type_id).scalar()
+    length = slot_length(duration)
+    candidates = (
+        db.query(Slot.resource_id)
+        .join(AppointmentTypeResource, AppointmentTypeResource.resource_id == Slot.resource_id)
+        .filter(
+            AppointmentTypeResource.appointment_type_id == appointment_type_id,
+            Slot.start_time == start_time,
+            Slot.is_available == True,
+            Slot.current_bookings_count < SLOT_CAPACITY,
+        )
+        .order_by(Slot.current_bookings_count, Slot.resource_id)
+        .all()
+    )
+
+    # A resource filled by a concurrent booking simply fails its UPDATE
+    for (resource_id,) in candidates:
+        slot_id = _claim_range(db, resource_id, start_time, length)
+        if slot_id is not None:
+            return ReservedSlot(slot_id, resource_id, start_time, start_time + length)
+    return None
+
+
+def reclaim_booking(db: Session, booking: Booking) -> bool:
+    """
+    Take the places of a booking back, e.g. when it is un-cancelled.
+    """
+    return _claim_range(db, booking.resource_id, booking.start_time, booking.end_time - booking.start_time) is not None
+
+
+def _range_filter(resource_id: int, start_time: datetime, end_time: datetime):
+    return (
+        Slot.resource_id == resource_id,
+        Slot.start_time >= start_time,
+        Slot.start_time < end_time,
+    )
+
+
+def release_slots(db: Session, released: Dict[BookedRange, int]) -> None:
+    """
+    Give back places, as {(resource_id, start_time, end_time): number_of_bookings}.
+    A slot closed only because it was full reopens; slots closed by a
+    schedule change stay closed.
+    """
+    resource_ids = set()
+    for (resource_id, start_time, end_time), count in released.items():
+        if resource_id is None or count <= 0:
+            continue
+        resource_ids.update(db.execute(
+            update(Slot)
+            .where(*_range_filter(resource_id, start_time, end_time))
+            .values(
+                current_bookings_count=case(
+                    (Slot.current_bookings_count > count, Slot.current_bookings_count - count),
+                    else_=0,
+                ),
+                is_available=case(
+                    (Slot.current_bookings_count >= SLOT_CAPACITY, True),
+                    else_=Slot.is_available,
+                ),
+            )
+            .returning(Slot.resource_id)
+            .execution_options(synchronize_session=False, change_scopes=())
+        ).scalars())
+    mark_changed(db, *resource_scopes(db, resource_ids))
+
+
+def occupy_slots(db: Session, taken: Dict[BookedRange, int]) -> None:
+    """
+    Count already-made bookings into the slots they cover, as
+    {(resource_id, start_time, end_time): number_of_bookings}. Used by
+    imports, which record bookings rather than request them, so capacity is
+    not enforced; a slot that fills up is closed.
+    """
+    resource_ids = set()
+    for (resource_id, start_time, end_time), count in taken.items():
+        if resource_id is None or count <= 0:
+            continue
+        resource_ids.update(db.execute(
+            update(Slot)
+            .where(*_range_filter(resource_id, start_time, end_time))
+            .values(
+                current_bookings_count=Slot.current_bookings_count + count,
+                is_available=Slot.is_available & (Slot.current_bookings_count + count < SLOT_CAPACITY),
+            )
+            .returning(Slot.resource_id)
+            .execution_options(synchronize_session=False, change_scopes=())
+        ).scalars())
+    mark_changed(db, *resource_scopes(db, resource_ids))
+
+
+def release_booking(db: Session, booking: Booking) -> None:
+    if booking.slot_id is not None:
+        release_slots(db, {(booking.resource_id, booking.start_time, booking.end_time): 1})
+
+
+def lock_grid_slot(db: Session, appointment_type_id: int, start_time: datetime) -> None:
+    """
+    Serialize bookings of one grid slot (types without Slot rows) until commit.
+    Uses a transaction-scoped advisory lock on PostgreSQL; other databases
+    already serialize writers.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(:type_id, :slot_minute)"),
+        {
+            "type_id": appointment_type_id,
+            "slot_minute": int(start_time.timestamp() // 60),
+        },
+    )
@@ -0,0 +1,24 @@
+"""
+Customer search on users.full_name and users.email.
+
+Matching is a case-insensitive substring ILIKE. On PostgreSQL the pg_trgm
+GIN indexes from migration fba5b18ddfdb serve these patterns, so lookups
+stay index scans on a large customer base.
+"""
+from sqlalchemy import or_
+
+from app.models.models import User
+
+
+def like_pattern(term: str) -> str:
+    """Substring pattern with LIKE wildcards in the term matched literally."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def user_search_clause(term: str):
+    pattern = like_pattern(term.strip())
+    return or_(
+        User.full_name.ilike(pattern, escape="\\"),
+        User.email.ilike(pattern, escape="\\"),
+    )
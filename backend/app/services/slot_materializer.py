@@ -0,0 +1,271 @@
+"""
+Pre-generates Slot rows from resource schedules for a rolling horizon.
+Run materialize_slots.py daily to roll the horizon forward.
+"""
+from datetime import date, datetime, time, timedelta
+from functools import reduce
+from itertools import chain
+from math import gcd
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import SLOT_HORIZON_DAYS
+from app.models.models import (
+    AppointmentType, AppointmentTypeResource, Booking, BookingStatus, Resource, Schedule, Slot,
+)
+from app.services.availability import SLOT_CAPACITY, SLOT_MINUTES
+
+_TOUCHED_SCHEDULES_KEY = "touched_schedules"
+_REGRIDDED_RESOURCES_KEY = "regridded_resources"
+
+
+# =====================
+# GENERATION
+# =====================
+
+def horizon_dates(start: Optional[date] = None, days: int = SLOT_HORIZON_DAYS) -> List[date]:
+    start = start or date.today()
+    return [start + timedelta(days=offset) for offset in range(days)]
+
+
+def resource_slot_minutes(db: Session, resource_id: int) -> int:
+    """
+    Base slot length for a resource: the largest length that divides every
+    duration of the appointment types it serves. Each booking then takes a
+    whole run of slots, so all types share one grid and one capacity.
+    """
+    durations = [
+        duration
+        for (duration,) in db.query(AppointmentType.duration_minutes)
+        .join(
+            AppointmentTypeResource,
+            AppointmentTypeResource.appointment_type_id == AppointmentType.id,
+        )
+        .filter(AppointmentTypeResource.resource_id == resource_id)
+        .distinct()
+    ]
+    return reduce(gcd, (duration or SLOT_MINUTES for duration in durations), 0) or SLOT_MINUTES
+
+
+def plan_day(
+    schedules: List[Schedule],
+    target_date: date,
+    slot_minutes: int,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    (start, end) pairs for one day: working windows cut into slots, skipping breaks.
+    """
+    weekday = target_date.weekday()
+    duration = timedelta(minutes=slot_minutes)
+
+    windows = []
+    breaks = []
+    for schedule in schedules:
+        if schedule.day_of_week != weekday:
+            continue
+        span = (
+            datetime.combine(target_date, schedule.start_time),
+            datetime.combine(target_date, schedule.end_time),
+        )
+        if schedule.is_unavailable:
+            breaks.append(span)
+        else:
+            windows.append(span)
+
+    planned = []
+    for window_start, window_end in sorted(windows):
+        cursor = window_start
+        while cursor + duration <= window_end:
+            slot_end = cursor + duration
+            overlapping = [b_end for b_start, b_end in breaks if b_start < slot_end and b_end > cursor]
+            if overlapping:
+                # Restart the grid where the break ends
+                cursor = max(overlapping)
+                continue
+            planned.append((cursor, slot_end))
+            cursor = slot_end
+
+    return planned
+
+
+def materialize_days(db: Session, resource_id: int, days: Iterable[date]) -> int:
+    """
+    Bring the resource's slots for the given days in line with its schedules.
+    Slots that still match keep their booking counts; slots that no longer fit
+    are deleted, or closed if any booking, cancelled or not, points at them.
+    New slots start with the live bookings already overlapping them.
+    Returns the number of slots created.
+    """
+    day_set = set(days)
+    if not day_set:
+        return 0
+
+    schedules = db.query(Schedule).filter(Schedule.resource_id == resource_id).all()
+    slot_minutes = resource_slot_minutes(db, resource_id)
+    window_start = datetime.combine(min(day_set), time.min)
+    window_end = datetime.combine(max(day_set) + timedelta(days=1), time.min)
+
+    wanted: Set[Tuple[datetime, datetime]] = set()
+    for target_date in day_set:
+        wanted.update(plan_day(schedules, target_date, slot_minutes))
+
+    existing = (
+        db.query(Slot)
+        .filter(
+            Slot.resource_id == resource_id,
+            Slot.start_time >= window_start,
+            Slot.start_time < window_end,
+        )
+        .all()
+    )
+
+    existing_keys = set()
+    unwanted = []
+    for slot in existing:
+        if slot.start_time.date() not in day_set:
+            continue
+        key = (slot.start_time, slot.end_time)
+        existing_keys.add(key)
+        if key in wanted:
+            slot.is_available = (slot.current_bookings_count or 0) < SLOT_CAPACITY
+        else:
+            unwanted.append(slot)
+
+    # Cancelled bookings release their place but keep pointing at the slot
+    referenced = set()
+    if unwanted:
+        referenced = {
+            slot_id
+            for (slot_id,) in db.query(Booking.slot_id)
+            .filter(Booking.slot_id.in_([slot.id for slot in unwanted]))
+            .distinct()
+        }
+    for slot in unwanted:
+        if slot.id in referenced:
+            slot.is_available = False
+        else:
+            db.delete(slot)
+
+    missing = sorted(wanted - existing_keys)
+    if not missing:
+        return 0
+
+    # A new grid under existing bookings has to carry their places over
+    booked = (
+        db.query(Booking.start_time, Booking.end_time)
+        .filter(
+            Booking.resource_id == resource_id,
+            Booking.start_time < window_end,
+            Booking.end_time > window_start,
+            Booking.status != BookingStatus.CANCELLED,
+        )
+        .all()
+    )
+    for start_time, end_time in missing:
+        count = sum(1 for b_start, b_end in booked if b_start < end_time and b_end > start_time)
+        db.add(Slot(
+            resource_id=resource_id,
+            start_time=start_time,
+            end_time=end_time,
+            is_available=count < SLOT_CAPACITY,
+            current_bookings_count=count,
+        ))
+    return len(missing)
+
+
+def materialize_resource(db: Session, resource_id: int, start: Optional[date] = None) -> int:
+    return materialize_days(db, resource_id, horizon_dates(start))
+
+
+def materialize_weekday(db: Session, resource_id: int, day_of_week: int, start: Optional[date] = None) -> int:
+    """
+    Regenerate only the horizon days that fall on the given weekday.
+    """
+    days = [d for d in horizon_dates(start) if d.weekday() == day_of_week]
+    return materialize_days(db, resource_id, days)
+
+
+def materialize_all(db: Session, start: Optional[date] = None) -> int:
+    created = 0
+    for (resource_id,) in db.query(Resource.id).all():
+        created += materialize_resource(db, resource_id, start)
+    return created
+
+
+# =====================
+# SCHEDULE CHANGE TRACKING
+# =====================
+
+def _linked_resource_ids(session, appointment_type_id: int) -> Set[int]:
+    return set(session.execute(
+        select(AppointmentTypeResource.resource_id)
+        .where(AppointmentTypeResource.appointment_type_id == appointment_type_id)
+    ).scalars())
+
+
+def _regridded_resource_ids(session, obj) -> Set[int]:
+    """
+    Resources whose base grid may change with this pending object: a type's
+    duration changed or it was deleted, or a type was linked to or unlinked
+    from a resource.
+    """
+    state = inspect(obj)
+    if isinstance(obj, AppointmentTypeResource):
+        return {obj.resource_id, *state.attrs.resource_id.history.deleted}
+    if isinstance(obj, AppointmentType):
+        history = state.attrs.resources.history
+        resource_ids = {resource.id for resource in chain(history.added, history.deleted)}
+        if state.persistent and (obj in session.deleted or state.attrs.duration_minutes.history.has_changes()):
+            resource_ids |= _linked_resource_ids(session, obj.id)
+        return resource_ids
+    if isinstance(obj, Resource) and state.attrs.appointment_types.history.has_changes():
+        return {obj.id}
+    return set()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_schedule_changes(session, flush_context, instances):
+    touched = session.info.setdefault(_TOUCHED_SCHEDULES_KEY, set())
+    regridded = session.info.setdefault(_REGRIDDED_RESOURCES_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Schedule):
+            regridded.update(
+                resource_id
+                for resource_id in _regridded_resource_ids(session, obj)
+                if resource_id is not None
+            )
+            continue
+        state = inspect(obj)
+        resource_ids = {obj.resource_id, *state.attrs.resource_id.history.deleted}
+        weekdays = {obj.day_of_week, *state.attrs.day_of_week.history.deleted}
+        touched.update(
+            (resource_id, day_of_week)
+            for resource_id in resource_ids
+            for day_of_week in weekdays
+            if resource_id is not None and day_of_week is not None
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def _rematerialize_touched_schedules(session):
+    # Commit flushes after this hook, so flush pending edits first
+    if any(
+        isinstance(obj, (Schedule, AppointmentType, AppointmentTypeResource, Resource))
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.flush()
+    touched = session.info.pop(_TOUCHED_SCHEDULES_KEY, None)
+    regridded = session.info.pop(_REGRIDDED_RESOURCES_KEY, None) or set()
+    for resource_id in sorted(regridded):
+        materialize_resource(session, resource_id)
+    for resource_id, day_of_week in sorted(touched or ()):
+        if resource_id not in regridded:
+            materialize_weekday(session, resource_id, day_of_week)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_touched_schedules(session):
+    session.info.pop(_TOUCHED_SCHEDULES_KEY, None)
+    session.info.pop(_REGRIDDED_RESOURCES_KEY, None)
@@ -0,0 +1,199 @@
+"""
+Change counters behind the ETag / If-None-Match layer. Session hooks work out
+which scopes a transaction touched and bump their counters just before it
+commits, so a reader can tell whether a response changed by reading a few
+integers instead of rebuilding it.
+"""
+import hashlib
+from itertools import chain
+from typing import Collection, Dict, Iterable, List, Optional, Set
+
+from fastapi import Request, Response
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    AppointmentType, AppointmentTypeResource, Booking, ChangeCounter,
+    Resource, Schedule, Slot, User,
+)
+from app.services.reporting import increment_row
+
+_TOUCHED_SCOPES_KEY = "touched_scopes"
+
+# Scopes. Single booking writes only bump the per-type and per-customer
+# scopes, so concurrent bookings of different types and customers do not
+# queue on one counter row; the shared scopes move for bulk writes and
+# catalog or schedule edits.
+SERVICES = "services"    # service definitions
+USERS = "users"          # user names shown as providers
+BOOKINGS = "bookings"    # bulk booking writes, for catalog booking counts
+SLOTS = "slots"          # slots, schedules and resource links of every type
+CUSTOMERS = "customers"  # every customer's booking list, for bulk writes
+
+
+def slots_scope(appointment_type_id) -> str:
+    return f"slots:{appointment_type_id}"
+
+
+# Derived: the sum of every type's slots counter, which moves on any booking
+ALL_TYPES_SLOTS = slots_scope("*")
+
+
+def customer_scope(customer_id: int) -> str:
+    return f"customer:{customer_id}"
+
+
+# Scopes bumped by bulk UPDATE/DELETE statements, which name no single row
+_BULK_SCOPES = {
+    AppointmentType: (SERVICES, SLOTS),
+    User: (USERS,),
+    Booking: (BOOKINGS, SLOTS, CUSTOMERS),
+    Slot: (SLOTS,),
+    Schedule: (SLOTS,),
+    Resource: (SLOTS,),
+    AppointmentTypeResource: (SLOTS,),
+}
+
+
+def _current_and_previous(obj, attr: str) -> Set:
+    values = {getattr(obj, attr), *inspect(obj).attrs[attr].history.deleted}
+    values.discard(None)
+    return values
+
+
+def _object_scopes(obj) -> Iterable[str]:
+    if isinstance(obj, Booking):
+        yield from (slots_scope(type_id) for type_id in _current_and_previous(obj, "appointment_type_id"))
+        yield from (customer_scope(customer_id) for customer_id in _current_and_previous(obj, "customer_id"))
+    elif isinstance(obj, AppointmentType):
+        yield SERVICES
+        yield SLOTS
+    elif isinstance(obj, User):
+        # Only names reach the catalog. New users own no services yet, and
+        # guest sign-ups or password rehashes must not queue on this counter
+        state = inspect(obj)
+        if state.persistent and (obj in state.session.deleted or state.attrs.full_name.history.has_changes()):
+            yield USERS
+    elif isinstance(obj, (Slot, Schedule, Resource, AppointmentTypeResource)):
+        yield SLOTS
+
+
+def mark_changed(db: Session, *scopes: str) -> None:
+    """
+    Record scopes changed by statements the hooks cannot see (raw SQL).
+    """
+    db.info.setdefault(_TOUCHED_SCOPES_KEY, set()).update(scopes)
+
+
+def resource_scopes(db: Session, resource_ids: Collection[int]) -> List[str]:
+    """
+    Slots scopes of every type booked through the given resources, whose
+    availability changes when one of the resources' slots fills or frees up.
+    """
+    if not resource_ids:
+        return []
+    type_ids = db.execute(
+        select(AppointmentTypeResource.appointment_type_id)
+        .where(AppointmentTypeResource.resource_id.in_(resource_ids))
+        .distinct()
+    ).scalars()
+    return [slots_scope(type_id) for type_id in type_ids]
+
+
+# =====================
+# SESSION HOOKS
+# =====================
+
+@event.listens_for(Session, "before_flush")
+def _track_changed_objects(session, flush_context, instances):
+    touched = session.info.setdefault(_TOUCHED_SCOPES_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        touched.update(_object_scopes(obj))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        # Statements that know which rows they change pass change_scopes,
+        # or an empty tuple when they mark their scopes themselves
+        scopes = orm_execute_state.execution_options.get("change_scopes")
+        mapper = orm_execute_state.bind_mapper
+        if scopes is None and mapper is not None:
+            scopes = _BULK_SCOPES.get(mapper.class_)
+        if scopes:
+            mark_changed(orm_execute_state.session, *scopes)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_touched_scopes(session):
+    # Commit flushes after this hook, so flush now to see every change
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    touched = session.info.pop(_TOUCHED_SCOPES_KEY, None)
+    # Sorted so concurrent transactions lock counter rows in the same order
+    for scope in sorted(touched or ()):
+        increment_row(session, ChangeCounter, {"scope": scope}, {"version": 1})
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_touched_scopes(session):
+    session.info.pop(_TOUCHED_SCOPES_KEY, None)
+
+
+# =====================
+# ETAGS
+# =====================
+
+async def current_versions(db: AsyncSession, *scopes: str) -> Dict[str, int]:
+    """
+    Versions of the given scopes. A scope ending in ":*" is derived as the
+    sum of every counter under its prefix, which only grows.
+    """
+    families = [scope[:-1] for scope in scopes if scope.endswith(":*")]
+    condition = ChangeCounter.scope.in_(scopes)
+    for prefix in families:
+        condition = condition | ChangeCounter.scope.startswith(prefix, autoescape=True)
+    rows = (await db.execute(select(ChangeCounter.scope, ChangeCounter.version).where(condition))).all()
+
+    versions = dict.fromkeys(scopes, 0)
+    for scope, version in rows:
+        if scope in versions:
+            versions[scope] = version
+        for prefix in families:
+            if scope.startswith(prefix):
+                versions[prefix + "*"] += version
+    return versions
+
+
+def make_etag(request: Request, versions: Dict[str, int]) -> str:
+    """
+    Weak ETag over the request's path and query plus the scope versions.
+    """
+    key = "|".join(
+        [request.url.path, str(sorted(request.query_params.multi_items()))]
+        + [f"{scope}={versions[scope]}" for scope in sorted(versions)]
+    )
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(",")}
+    # Weak comparison: W/"x" and "x" name the same version
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return "*" in candidates or etag in candidates or bare in candidates
+
+
+def not_modified(request: Request, response: Response, versions: Dict[str, int]) -> Optional[Response]:
+    """
+    Set the ETag for `versions` on the response. Returns a 304 response to
+    send instead when the client already holds this version.
+    """
+    etag = make_etag(request, versions)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
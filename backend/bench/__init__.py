@@ -0,0 +1,3 @@
+"""
+Load benchmarks: synthetic datasets and per-endpoint timings.
+"""
@@ -0,0 +1,180 @@
+"""
+Synthetic dataset generator. Rows go in with batched Core inserts so that
+millions of bookings load in minutes rather than hours.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    AppointmentType, AppointmentTypeResource, Booking, BookingDailyRollup,
+    BookingStatus, PaymentStatus, Resource, Schedule, User, UserRole,
+)
+from app.services.availability import SLOT_MINUTES
+from app.services.slot_materializer import materialize_all
+
+BATCH_SIZE = 10_000
+
+# Share of bookings per status
+STATUS_WEIGHTS = {
+    BookingStatus.CONFIRMED: 60,
+    BookingStatus.COMPLETED: 25,
+    BookingStatus.CANCELLED: 10,
+    BookingStatus.PENDING: 5,
+}
+
+FIRST_NAMES = ["Ann", "Ben", "Chloe", "Dev", "Elena", "Farid", "Grace", "Hiro", "Isha", "Jon", "Kavya", "Liam"]
+LAST_NAMES = ["Shah", "Smith", "Rao", "Chen", "Garcia", "Khan", "Ivanova", "Okafor", "Patel", "Brown"]
+
+
+def _batches(rows, size: int = BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert_all(conn, model, rows) -> int:
+    count = 0
+    for batch in _batches(rows):
+        conn.execute(insert(model), batch)
+        count += len(batch)
+    return count
+
+
+def _ids(conn, column, *where) -> List[int]:
+    return list(conn.execute(select(column).where(*where).order_by(column)).scalars())
+
+
+def generate(
+    engine: Engine,
+    bookings: int = 10_000,
+    services: int = 50,
+    resources: int = 20,
+    customers: int = 0,
+    days_back: int = 365,
+    days_ahead: int = 60,
+    seed: int = 42,
+) -> dict:
+    """
+    Fill an empty schema with a reproducible dataset and return its sizes.
+    Half the services book against materialized slots, half use the grid.
+    """
+    rng = random.Random(seed)
+    customers = customers or max(bookings // 10, 10)
+    organisers = max(services // 5, 1)
+    today = date.today()
+
+    with engine.begin() as conn:
+        _insert_all(conn, User, (
+            {
+                "email": f"organiser{n}@bench.test",
+                "password_hash": "bench",
+                "full_name": f"Dr. {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "role": UserRole.ORGANISER,
+            }
+            for n in range(organisers)
+        ))
+        _insert_all(conn, User, (
+            {
+                "email": f"customer{n}@bench.test",
+                "password_hash": "bench",
+                "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {n}",
+                "role": UserRole.CUSTOMER,
+            }
+            for n in range(customers)
+        ))
+        organiser_ids = _ids(conn, User.id, User.role == UserRole.ORGANISER)
+        customer_ids = _ids(conn, User.id, User.role == UserRole.CUSTOMER)
+
+        _insert_all(conn, AppointmentType, (
+            {
+                "name": f"Service {n}",
+                "duration_minutes": SLOT_MINUTES,
+                "price": str(rng.choice([300, 500, 800, 1200])),
+                "is_published": n % 10 != 0,
+                "owner_id": rng.choice(organiser_ids),
+            }
+            for n in range(services)
+        ))
+        _insert_all(conn, Resource, ({"name": f"Resource {n}"} for n in range(resources)))
+        service_ids = _ids(conn, AppointmentType.id)
+        resource_ids = _ids(conn, Resource.id)
+
+        _insert_all(conn, Schedule, (
+            {
+                "resource_id": resource_id,
+                "day_of_week": weekday,
+                "start_time": time(9, 0),
+                "end_time": time(17, 0),
+                "is_unavailable": False,
+            }
+            for resource_id in resource_ids
+            for weekday in range(5)
+        ))
+        links = {
+            (service_id, rng.choice(resource_ids))
+            for service_id in service_ids[::2]
+            for _ in range(2)
+        }
+        _insert_all(conn, AppointmentTypeResource, (
+            {"appointment_type_id": service_id, "resource_id": resource_id}
+            for service_id, resource_id in sorted(links)
+        ))
+        linked_resource = dict(sorted(links))
+
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        slots_per_day = (17 - 9) * 60 // SLOT_MINUTES
+        span_days = days_back + days_ahead
+
+        def booking_rows():
+            for _ in range(bookings):
+                service_id = rng.choice(service_ids)
+                day = today - timedelta(days=days_back) + timedelta(days=rng.randrange(span_days))
+                start_time = datetime.combine(day, time(9, 0)) + timedelta(
+                    minutes=SLOT_MINUTES * rng.randrange(slots_per_day)
+                )
+                yield {
+                    "customer_id": rng.choice(customer_ids),
+                    "appointment_type_id": service_id,
+                    "resource_id": linked_resource.get(service_id),
+                    "start_time": start_time,
+                    "end_time": start_time + timedelta(minutes=SLOT_MINUTES),
+                    "status": rng.choices(statuses, weights)[0],
+                    "payment_status": PaymentStatus.PENDING,
+                }
+
+        _insert_all(conn, Booking, booking_rows())
+
+        # Reports read rollups only, so derive them once from the bookings
+        day = func.date(Booking.start_time)
+        conn.execute(
+            insert(BookingDailyRollup).from_select(
+                ["day", "appointment_type_id", "status", "booking_count"],
+                select(day, Booking.appointment_type_id, Booking.status, func.count(Booking.id))
+                .group_by(day, Booking.appointment_type_id, Booking.status),
+            )
+        )
+
+    with Session(engine) as db:
+        slots = materialize_all(db)
+        db.commit()
+
+    return {
+        "bookings": bookings,
+        "services": services,
+        "resources": resources,
+        "customers": customers,
+        "organisers": organisers,
+        "slots": slots,
+        "seed": seed,
+    }
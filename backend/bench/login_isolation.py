@@ -0,0 +1,172 @@
+"""
+Login isolation benchmark. Serves the app with uvicorn, measures /api/slots
+latency on its own, then again while concurrent clients log in as fast as
+they can. With password hashing on its own process pool the two slot
+latency profiles should match, given more CPU cores than --hash-workers;
+on fewer, the hashing processes and the server share cores and slots slow
+down regardless.
+
+    python -m bench.login_isolation --login-clients 16 --seconds 10
+    python -m bench.login_isolation --database-url postgresql+psycopg2://... --bcrypt-rounds 12
+
+Point --database-url at a scratch database: every table in it is dropped
+and a small dataset generated.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from bench.run import DEFAULT_DATABASE_URL, PERCENTILES, git_commit, percentile
+
+LOGIN_EMAIL = "login-bench@example.com"
+LOGIN_PASSWORD = "login-bench-password"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, bcrypt_rounds: int, hash_workers: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        BCRYPT_ROUNDS=str(bcrypt_rounds),
+        PASSWORD_HASH_WORKERS=str(hash_workers),
+        REQUEST_LOG_ENABLED="false",
+        OUTBOX_WORKER_ENABLED="false",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    sys.exit("Server did not start within 30s")
+
+
+def slot_latencies(client: httpx.Client, params: dict, seconds: float) -> list:
+    latencies = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        client.get("/api/slots", params=params).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def login_load(base_url: str, clients: int, stop: threading.Event, counts: list) -> list:
+    def run(index: int):
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            while not stop.is_set():
+                response = client.post("/api/auth/login", json={"email": LOGIN_EMAIL, "password": LOGIN_PASSWORD})
+                counts[index] += response.status_code == 200
+
+    threads = [threading.Thread(target=run, args=(i,), daemon=True) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def summarize(latencies: list) -> dict:
+    summary = {f"p{pct}_ms": round(percentile(latencies, pct), 2) for pct in PERCENTILES}
+    summary["requests"] = len(latencies)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--login-clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10, help="Duration of each phase")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--out", default="login-isolation-results.json")
+    args = parser.parse_args(argv)
+
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import create_engine, select
+
+    from app.models.models import AppointmentType, Base
+    from bench.dataset import generate
+
+    engine = create_engine(args.database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    generate(engine, bookings=2_000, services=5, resources=5)
+    with engine.connect() as conn:
+        type_id = conn.execute(select(AppointmentType.id).limit(1)).scalar()
+    engine.dispose()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(args.database_url, port, args.bcrypt_rounds, args.hash_workers)
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            client.post(
+                "/api/users",
+                json={"email": LOGIN_EMAIL, "password": LOGIN_PASSWORD, "full_name": "Login Bench"},
+            ).raise_for_status()
+            params = {"date": (date.today() + timedelta(days=1)).isoformat(), "appointment_type_id": type_id}
+            slot_latencies(client, params, 1)  # warm up
+
+            idle = summarize(slot_latencies(client, params, args.seconds))
+
+            stop = threading.Event()
+            counts = [0] * args.login_clients
+            threads = login_load(base_url, args.login_clients, stop, counts)
+            time.sleep(1)  # let the login load ramp up
+            logins_before = sum(counts)
+            loaded = summarize(slot_latencies(client, params, args.seconds))
+            logins_per_second = (sum(counts) - logins_before) / args.seconds
+            stop.set()
+            for thread in threads:
+                thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    for name, summary in (("slots idle", idle), ("slots under logins", loaded)):
+        print(
+            f"{name:20} p50 {summary['p50_ms']:8.2f}ms  p95 {summary['p95_ms']:8.2f}ms  "
+            f"p99 {summary['p99_ms']:8.2f}ms  requests {summary['requests']}"
+        )
+    print(f"{'logins':20} {logins_per_second:.1f}/s from {args.login_clients} clients")
+    p95_ratio = loaded["p95_ms"] / idle["p95_ms"] if idle["p95_ms"] else 0.0
+    print(f"{'p95 slowdown':20} x{p95_ratio:.2f}")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "database": args.database_url.split(":", 1)[0],
+        "cpus": os.cpu_count(),
+        "bcrypt_rounds": args.bcrypt_rounds,
+        "hash_workers": args.hash_workers,
+        "login_clients": args.login_clients,
+        "logins_per_second": round(logins_per_second, 1),
+        "slots_idle": idle,
+        "slots_under_logins": loaded,
+        "p95_slowdown": round(p95_ratio, 2),
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Endpoint benchmark. Builds (or reuses) a synthetic dataset, calls each API
+endpoint through FastAPI's TestClient and records latency percentiles and
+SQL statement counts per request.
+
+    python -m bench.run --bookings 100000 --out bench-results.json
+    python -m bench.run --database-url postgresql+psycopg2://... --bookings 1000000
+    python -m bench.run --reuse --compare bench-results.json
+
+Point --database-url at a scratch database: unless --reuse is given, every
+table in it is dropped and a fresh dataset generated.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+
+DEFAULT_DATABASE_URL = "sqlite:///bench.db"
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies_ms: List[float], queries: List[int], statuses: List[int]) -> dict:
+    summary = {f"p{pct}_ms": round(percentile(latencies_ms, pct), 3) for pct in PERCENTILES}
+    summary.update(
+        mean_ms=round(statistics.fmean(latencies_ms), 3),
+        max_ms=round(max(latencies_ms), 3),
+        requests=len(latencies_ms),
+        queries_mean=round(statistics.fmean(queries), 2),
+        queries_max=max(queries),
+        errors=sum(1 for status in statuses if status >= 400),
+    )
+    return summary
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def endpoints(rng: random.Random, sample: dict) -> Dict[str, Callable[[], tuple]]:
+    """
+    Request factories per endpoint; each call returns (path, params).
+    """
+    today = date.today()
+
+    def some_day(span: int = 30) -> date:
+        return today + timedelta(days=rng.randrange(-span, span))
+
+    def pick(key):
+        return rng.choice(sample[key])
+
+    def calendar_week():
+        start = some_day()
+        return "/api/calendar/feed", {"start": start.isoformat(), "end": (start + timedelta(days=6)).isoformat()}
+
+    return {
+        "services": lambda: ("/api/services", {"published_only": "false"}),
+        "slots_day": lambda: (
+            "/api/slots",
+            {"date": some_day().isoformat(), "appointment_type_id": pick("service_ids")},
+        ),
+        "slots_month": lambda: (
+            "/api/slots/range",
+            {
+                "start_date": today.isoformat(),
+                "end_date": (today + timedelta(days=30)).isoformat(),
+                "appointment_type_id": pick("service_ids"),
+            },
+        ),
+        "customer_bookings": lambda: ("/api/bookings", {"customer_email": pick("customer_emails")}),
+        "admin_appointments": lambda: ("/api/admin/appointments", {"limit": 50}),
+        "admin_appointments_day": lambda: (
+            "/api/admin/appointments",
+            {"date_from": some_day().isoformat(), "date_to": some_day().isoformat(), "limit": 50},
+        ),
+        "admin_search": lambda: ("/api/admin/appointments", {"search": pick("search_terms"), "limit": 50}),
+        "admin_summary": lambda: ("/api/admin/appointments/summary", {}),
+        "calendar_week": calendar_week,
+        "report_bookings": lambda: (
+            "/api/reports/bookings",
+            {"date_from": (today - timedelta(days=30)).isoformat(), "date_to": today.isoformat()},
+        ),
+        "user_search": lambda: ("/api/users", {"search": pick("search_terms")}),
+    }
+
+
+def load_sample(engine) -> dict:
+    from sqlalchemy import select
+
+    from app.models.models import AppointmentType, User, UserRole
+
+    with engine.connect() as conn:
+        service_ids = list(conn.execute(select(AppointmentType.id).limit(500)).scalars())
+        customer_emails = list(conn.execute(
+            select(User.email).where(User.role == UserRole.CUSTOMER).limit(500)
+        ).scalars())
+    if not service_ids or not customer_emails:
+        sys.exit("Dataset is empty; run without --reuse to generate one.")
+    return {
+        "service_ids": service_ids,
+        "customer_emails": customer_emails,
+        "search_terms": ["ann", "chen", "customer12", "@bench", "zz-no-match"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--bookings", type=int, default=10_000)
+    parser.add_argument("--services", type=int, default=50)
+    parser.add_argument("--resources", type=int, default=20)
+    parser.add_argument("--customers", type=int, default=0, help="Defaults to bookings / 10")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed requests per endpoint")
+    parser.add_argument("--only", nargs="*", help="Endpoint names to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reuse", action="store_true", help="Benchmark the existing dataset")
+    parser.add_argument("--out", default="bench-results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare p50/p95 against")
+    args = parser.parse_args(argv)
+
+    # The app reads its database settings at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.database import async_engine, engine
+    from app.main import app
+    from app.models.models import Base
+    from bench.dataset import generate
+
+    dataset = None
+    if not args.reuse:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        started = time.perf_counter()
+        dataset = generate(
+            engine,
+            bookings=args.bookings,
+            services=args.services,
+            resources=args.resources,
+            customers=args.customers,
+            seed=args.seed,
+        )
+        dataset["load_seconds"] = round(time.perf_counter() - started, 2)
+        print(f"Generated {dataset['bookings']} bookings in {dataset['load_seconds']}s")
+
+    statements = [0]
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    for sync_engine in (engine, async_engine.sync_engine):
+        event.listen(sync_engine, "before_cursor_execute", _count)
+
+    rng = random.Random(args.seed)
+    factories = endpoints(rng, load_sample(engine))
+    names = args.only or list(factories)
+    results = {}
+    with TestClient(app) as client:
+        for name in names:
+            make_request = factories[name]
+            for _ in range(args.warmup):
+                path, params = make_request()
+                client.get(path, params=params)
+
+            latencies, queries, statuses = [], [], []
+            for _ in range(args.requests):
+                path, params = make_request()
+                statements[0] = 0
+                started = time.perf_counter()
+                response = client.get(path, params=params)
+                latencies.append((time.perf_counter() - started) * 1000)
+                queries.append(statements[0])
+                statuses.append(response.status_code)
+
+            results[name] = summarize(latencies, queries, statuses)
+            r = results[name]
+            print(
+                f"{name:24} p50 {r['p50_ms']:9.2f}ms  p95 {r['p95_ms']:9.2f}ms  "
+                f"p99 {r['p99_ms']:9.2f}ms  queries {r['queries_mean']:6.1f}  errors {r['errors']}"
+            )
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "dataset": dataset,
+        "requests_per_endpoint": args.requests,
+        "endpoints": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+def compare(path: str, report: dict) -> None:
+    with open(path) as f:
+        previous = json.load(f)
+    print(f"\nAgainst {previous.get('commit')} ({path}):")
+    for name, current in report["endpoints"].items():
+        before = previous.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms"):
+            change = (current[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            deltas.append(f"{key[:-3]} {before[key]:.2f} -> {current[key]:.2f}ms ({change:+.0f}%)")
+        deltas.append(f"queries {before['queries_mean']} -> {current['queries_mean']}")
+        print(f"{name:24} " + "  ".join(deltas))
+
+
+if __name__ == "__main__":
+    main()
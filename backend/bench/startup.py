@@ -0,0 +1,127 @@
+"""
+Startup benchmark. Each run boots the app in a fresh interpreter and times
+importing app.main, running its lifespan startup, and serving the first
+request, then reports the median and worst of each.
+
+    python -m bench.startup --runs 10 --out startup-results.json
+    python -m bench.startup --compare startup-results.json
+
+The first request goes to /api/services, so it includes opening the first
+database connection; tables are created in --database-url when missing.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from bench.run import DEFAULT_DATABASE_URL, git_commit
+
+FIRST_REQUEST_PATH = "/api/services"
+PHASES = ("import_ms", "startup_ms", "first_request_ms")
+
+
+def measure_once() -> dict:
+    """
+    Runs inside the child interpreter; the parent reads the printed JSON.
+    """
+    started = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    from fastapi.testclient import TestClient
+
+    client = TestClient(app)
+    before_startup = time.perf_counter()
+    with client:
+        booted = time.perf_counter()
+        response = client.get(FIRST_REQUEST_PATH)
+        served = time.perf_counter()
+
+    return {
+        "import_ms": round((imported - started) * 1000, 2),
+        "startup_ms": round((booted - before_startup) * 1000, 2),
+        "first_request_ms": round((served - booted) * 1000, 2),
+        "status": response.status_code,
+    }
+
+
+def run_child(database_url: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=database_url, REQUEST_LOG_ENABLED="false")
+    output = subprocess.check_output(
+        [sys.executable, "-m", "bench.startup", "--child"],
+        env=env,
+        text=True,
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--out", default="startup-results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare medians against")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return
+
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import create_engine
+
+    from app.models.models import Base
+
+    Base.metadata.create_all(create_engine(args.database_url))
+
+    runs = [run_child(args.database_url) for _ in range(args.runs)]
+    results = {
+        phase: {
+            "median": round(statistics.median(run[phase] for run in runs), 2),
+            "max": max(run[phase] for run in runs),
+        }
+        for phase in PHASES
+    }
+    for phase, summary in results.items():
+        print(f"{phase:18} median {summary['median']:9.2f}ms  max {summary['max']:9.2f}ms")
+    errors = sum(1 for run in runs if run["status"] >= 400)
+    if errors:
+        print(f"{errors} of {len(runs)} first requests failed")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "database": args.database_url.split(":", 1)[0],
+        "python": platform.python_version(),
+        "runs": len(runs),
+        "phases": results,
+        "errors": errors,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+def compare(path: str, report: dict) -> None:
+    with open(path) as f:
+        previous = json.load(f)
+    print(f"\nAgainst {previous.get('commit')} ({path}):")
+    for phase, current in report["phases"].items():
+        before = previous.get("phases", {}).get(phase)
+        if not before:
+            continue
+        change = (current["median"] - before["median"]) / before["median"] * 100 if before["median"] else 0.0
+        print(f"{phase:18} {before['median']:.2f} -> {current['median']:.2f}ms ({change:+.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
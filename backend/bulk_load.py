@@ -0,0 +1,42 @@
+"""
+Bulk load users, resources, services, schedules or bookings from CSV/JSON.
+
+    python bulk_load.py users.csv bookings.jsonl
+    python bulk_load.py --entity bookings export.csv
+    python bulk_load.py bundle.json
+
+Single-entity files are recognised by name (users.csv, services.json, ...);
+any other .json file is read as a bundle {"users": [...], "bookings": [...]}.
+References use natural keys: user_email, owner_email, customer_email,
+resource_name, service_name and resource_names ("Room A;Room B").
+"""
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.services.bulk_load import BATCH_SIZE, load_path
+
+
+def bulk_load(paths, entity=None, batch_size=BATCH_SIZE):
+    db = SessionLocal()
+    try:
+        for path in paths:
+            started = time.perf_counter()
+            loaded = load_path(db, path, entity, batch_size)
+            elapsed = time.perf_counter() - started
+            summary = ", ".join(f"{count} {name}" for name, count in loaded.items())
+            print(f"{path}: loaded {summary} in {elapsed:.2f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--entity", choices=["users", "resources", "services", "schedules", "bookings"])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    bulk_load(args.paths, args.entity, args.batch_size)
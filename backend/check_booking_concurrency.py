@@ -0,0 +1,109 @@
+"""
+Stress test for booking capacity: fires many parallel bookings at one slot
+and checks that exactly SLOT_CAPACITY of them succeed.
+
+    python check_booking_concurrency.py [requests] [workers]
+"""
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from app.api.appointments import create_booking
+from app.database import SessionLocal
+from app.models.models import (
+    AppointmentType, AppointmentTypeResource, Booking, Resource, Slot, User,
+)
+from app.schemas.appointment import BookingCreate
+from app.services.availability import SLOT_CAPACITY
+
+
+def book_once(appointment_type_id: int, start_time: datetime, run_id: str, n: int) -> str:
+    db = SessionLocal()
+    try:
+        create_booking(
+            BookingCreate(
+                appointment_type_id=appointment_type_id,
+                start_time=start_time,
+                customer_name=f"Stress {n}",
+                customer_email=f"stress-{run_id}-{n}@example.com",
+            ),
+            db,
+        )
+        return "booked"
+    except HTTPException:
+        return "full"
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        return "error"
+    finally:
+        db.close()
+
+
+def check_booking_concurrency(requests: int = 300, workers: int = 50):
+    run_id = uuid.uuid4().hex[:8]
+    start_time = (datetime.now() + timedelta(days=365)).replace(hour=9, minute=0, second=0, microsecond=0)
+
+    db = SessionLocal()
+    try:
+        appt_type = AppointmentType(name=f"Stress test {run_id}", duration_minutes=30)
+        resource = Resource(name=f"Stress resource {run_id}")
+        db.add_all([appt_type, resource])
+        db.commit()
+        db.add(AppointmentTypeResource(appointment_type_id=appt_type.id, resource_id=resource.id))
+        slot = Slot(
+            resource_id=resource.id,
+            start_time=start_time,
+            end_time=start_time + timedelta(minutes=30),
+            is_available=True,
+            current_bookings_count=0,
+        )
+        db.add(slot)
+        db.commit()
+        appt_type_id, resource_id, slot_id = appt_type.id, resource.id, slot.id
+    finally:
+        db.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(
+                lambda n: book_once(appt_type_id, start_time, run_id, n),
+                range(requests),
+            ))
+
+        db = SessionLocal()
+        try:
+            slot = db.query(Slot).filter(Slot.id == slot_id).first()
+            stored = db.query(Booking).filter(Booking.slot_id == slot_id).count()
+        finally:
+            db.close()
+
+        booked = outcomes.count("booked")
+        print(
+            f"{requests} requests: {booked} booked, {outcomes.count('full')} rejected, "
+            f"{outcomes.count('error')} errors; slot count {slot.current_bookings_count}, "
+            f"bookings stored {stored}"
+        )
+        assert booked == SLOT_CAPACITY, f"Expected {SLOT_CAPACITY} bookings, got {booked}"
+        assert stored == SLOT_CAPACITY, "Bookings table disagrees with capacity"
+        assert slot.current_bookings_count == SLOT_CAPACITY, "Slot counter drifted"
+        assert not slot.is_available, "Full slot still marked available"
+        print("OK")
+    finally:
+        db = SessionLocal()
+        try:
+            db.query(Booking).filter(Booking.slot_id == slot_id).delete()
+            db.query(User).filter(User.email.like(f"stress-{run_id}-%")).delete(synchronize_session=False)
+            db.query(Slot).filter(Slot.id == slot_id).delete()
+            db.query(AppointmentTypeResource).filter(AppointmentTypeResource.resource_id == resource_id).delete()
+            db.query(Resource).filter(Resource.id == resource_id).delete()
+            db.query(AppointmentType).filter(AppointmentType.id == appt_type_id).delete()
+            db.commit()
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    check_booking_concurrency(*args)
@@ -0,0 +1,162 @@
+"""
+Runs EXPLAIN on the hot read paths against the configured (seeded) Postgres
+database and fails unless each one is served by the index meant for it.
+
+Sequential scans are disabled for the session, so the planner picks any
+usable index even on a small seed. That alone proves little: a scan of some
+other index (often a primary key) with a Filter avoids "Seq Scan" too, so
+every query names the indexes its plan has to use.
+
+    python check_query_plans.py
+"""
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import func, select
+
+from app.database import engine
+from app.models.models import (
+    AppointmentType, AppointmentTypeResource, Booking, BookingDailyRollup,
+    BookingStatus, Slot, User,
+)
+from app.services.appointment_queries import (
+    appointment_rows_query,
+    calendar_events_query,
+    newest_first_page,
+)
+from app.services.search import user_search_clause
+
+
+def _first_id(conn, column, default=1):
+    value = conn.execute(select(column).order_by(column).limit(1)).scalar()
+    return value if value is not None else default
+
+
+def hot_queries(conn):
+    type_id = _first_id(conn, AppointmentType.id)
+    customer_id = _first_id(conn, Booking.customer_id)
+    email = conn.execute(select(User.email).limit(1)).scalar() or "someone@example.com"
+    day_start = datetime.combine(datetime.now().date(), time.min)
+    day_end = day_start + timedelta(days=1)
+    week_end = day_start + timedelta(days=7)
+
+    queries = {
+        "slot availability counts": (
+            ("ix_bookings_type_start_active",),
+            select(Booking.start_time, func.count(Booking.id))
+            .where(
+                Booking.appointment_type_id == type_id,
+                Booking.start_time >= day_start,
+                Booking.start_time < day_end,
+                Booking.status != BookingStatus.CANCELLED,
+            )
+            .group_by(Booking.start_time)
+        ),
+        "grid capacity check": (
+            ("ix_bookings_type_start_active",),
+            select(func.count(Booking.id))
+            .where(
+                Booking.appointment_type_id == type_id,
+                Booking.start_time == day_start.replace(hour=9),
+                Booking.status != BookingStatus.CANCELLED,
+            )
+        ),
+        "materialized slots": (
+            ("ix_slots_resource_id_start_time",),
+            select(Slot.id, Slot.start_time, Slot.current_bookings_count)
+            .join(AppointmentTypeResource, AppointmentTypeResource.resource_id == Slot.resource_id)
+            .where(
+                AppointmentTypeResource.appointment_type_id == type_id,
+                Slot.start_time >= day_start,
+                Slot.start_time < week_end,
+            )
+        ),
+        "customer lookup by email": (
+            ("ix_users_email",),
+            select(User.id).where(User.email == email),
+        ),
+        "customer bookings page": (
+            ("ix_bookings_customer_start_id",),
+            newest_first_page(
+                select(Booking.id, Booking.start_time, AppointmentType.name)
+                .outerjoin(AppointmentType, AppointmentType.id == Booking.appointment_type_id)
+                .where(Booking.customer_id == customer_id),
+                None,
+                50,
+            ),
+        ),
+        "admin appointments by day": (
+            ("ix_bookings_start_time",),
+            newest_first_page(
+                appointment_rows_query(
+                    date_from=day_start.strftime("%Y-%m-%d"),
+                    date_to=day_start.strftime("%Y-%m-%d"),
+                ),
+                None,
+                100,
+            ),
+        ),
+        "calendar feed week": (
+            ("ix_bookings_start_time",),
+            calendar_events_query(day_start, week_end),
+        ),
+        "customer search": (
+            ("ix_users_full_name_trgm", "ix_users_email_trgm"),
+            select(User.id).where(user_search_clause("ann")),
+        ),
+        "booking report month": (
+            ("booking_daily_rollups_pkey",),
+            select(BookingDailyRollup.status, func.sum(BookingDailyRollup.booking_count))
+            .where(
+                BookingDailyRollup.day >= day_start.date(),
+                BookingDailyRollup.day <= (day_start + timedelta(days=30)).date(),
+            )
+            .group_by(BookingDailyRollup.status)
+        ),
+    }
+
+    if conn.exec_driver_sql("SELECT to_regclass('payments')").scalar():
+        booking_id = _first_id(conn, Booking.id)
+        queries["payments for booking"] = (
+            ("ix_payments_booking_id",),
+            f"SELECT id, status FROM payments WHERE booking_id = {int(booking_id)}",
+        )
+
+    return queries
+
+
+def explain(conn, query) -> list:
+    if not isinstance(query, str):
+        query = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    return [row[0] for row in conn.exec_driver_sql("EXPLAIN " + query)]
+
+
+def check_query_plans():
+    if engine.dialect.name != "postgresql":
+        print("Query plans can only be checked against PostgreSQL.")
+        return
+
+    failures = []
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        try:
+            for name, (indexes, query) in hot_queries(conn).items():
+                plan = explain(conn, query)
+                problems = [f"Seq Scan: {line.strip()}" for line in plan if "Seq Scan" in line]
+                problems += [
+                    f"{index} not used"
+                    for index in indexes
+                    if not any(f" {index} " in f"{line} " for line in plan)
+                ]
+                print(f"{'FAIL' if problems else 'ok  '} {name}")
+                if problems:
+                    failures.append(name)
+                    print("\n".join(f"       {problem}" for problem in problems))
+                    print("\n".join(f"       {line}" for line in plan))
+        finally:
+            conn.exec_driver_sql("RESET enable_seqscan")
+
+    assert not failures, f"Queries not served by their index: {', '.join(failures)}"
+    print("OK")
+
+if __name__ == "__main__":
+    check_query_plans()
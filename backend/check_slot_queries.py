@@ -0,0 +1,53 @@
+from datetime import date, time
+from sqlalchemy import event
+from app.database import SessionLocal, engine
+from app.models.models import AppointmentType
+from app.services import availability
+
+
+def count_queries(fn):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return len(statements)
+
+
+def check_slot_queries():
+    db = SessionLocal()
+    try:
+        appt_type = db.query(AppointmentType).first()
+        if not appt_type:
+            print("No appointment types found, seed the database first.")
+            return
+
+        target_date = date.today()
+        default_day = count_queries(
+            lambda: availability.get_day_availability(db, appt_type.id, target_date)
+        )
+
+        # Stretch the working day to check the query count does not grow with it
+        original_start, original_end = availability.WORK_START, availability.WORK_END
+        availability.WORK_START, availability.WORK_END = time(0, 0), time(23, 30)
+        try:
+            long_day = count_queries(
+                lambda: availability.get_day_availability(db, appt_type.id, target_date)
+            )
+        finally:
+            availability.WORK_START, availability.WORK_END = original_start, original_end
+
+        print(f"Queries for default day: {default_day}, for 24h day: {long_day}")
+        assert default_day <= 2, f"Expected at most 2 queries, got {default_day}"
+        assert long_day == default_day, "Query count grows with the length of the day"
+        print("OK")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    check_slot_queries()
@@ -0,0 +1,91 @@
+"""
+Checks that slots follow changes to what a resource serves: editing a
+service's duration and linking a new service to a resource must both
+leave bookable slots of the right length behind.
+
+    python check_slot_regrid.py
+"""
+import uuid
+from datetime import date, datetime, time, timedelta
+
+from app.api.appointments import create_booking, update_service
+from app.database import SessionLocal
+from app.models.models import (
+    AppointmentType, AppointmentTypeResource, Booking, Resource, Schedule, Slot, User,
+)
+from app.schemas.appointment import BookingCreate
+from app.schemas.service import ServiceUpdate
+from app.services.availability import get_day_availability
+
+
+def check_bookable(db, appointment_type_id: int, target_date: date, minutes: int, email: str) -> None:
+    slots = get_day_availability(db, appointment_type_id, target_date)
+    assert slots, f"No slots listed for type {appointment_type_id}"
+    lengths = {slot.end_time - slot.start_time for slot in slots}
+    assert lengths == {timedelta(minutes=minutes)}, f"Expected {minutes}-minute slots, got {lengths}"
+
+    booking = create_booking(
+        BookingCreate(
+            appointment_type_id=appointment_type_id,
+            start_time=slots[0].start_time,
+            customer_name="Regrid check",
+            customer_email=email,
+        ),
+        db,
+    )
+    assert booking.end_time - booking.start_time == timedelta(minutes=minutes), "Booking has the wrong length"
+
+
+def check_slot_regrid():
+    run_id = uuid.uuid4().hex[:8]
+    target_date = date.today() + timedelta(days=1)
+    type_ids, resource_id = [], None
+
+    db = SessionLocal()
+    try:
+        appt_type = AppointmentType(name=f"Regrid check {run_id}", duration_minutes=30)
+        resource = Resource(name=f"Regrid resource {run_id}")
+        db.add_all([appt_type, resource])
+        db.flush()
+        type_ids.append(appt_type.id)
+        resource_id = resource.id
+        db.add(AppointmentTypeResource(appointment_type_id=appt_type.id, resource_id=resource_id))
+        db.add(Schedule(
+            resource_id=resource_id,
+            day_of_week=target_date.weekday(),
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+        ))
+        db.commit()
+        check_bookable(db, appt_type.id, target_date, 30, f"regrid-{run_id}-1@example.com")
+
+        # Case 1: the service gets longer
+        update_service(appt_type.id, ServiceUpdate(duration_minutes=60), db)
+        check_bookable(db, appt_type.id, target_date, 60, f"regrid-{run_id}-2@example.com")
+        print("Duration change: slots rematerialized")
+
+        # Case 2: a shorter service is linked to the same resource
+        short_type = AppointmentType(name=f"Regrid check short {run_id}", duration_minutes=20)
+        db.add(short_type)
+        db.flush()
+        type_ids.append(short_type.id)
+        db.add(AppointmentTypeResource(appointment_type_id=short_type.id, resource_id=resource_id))
+        db.commit()
+        check_bookable(db, short_type.id, target_date, 20, f"regrid-{run_id}-3@example.com")
+        check_bookable(db, appt_type.id, target_date, 60, f"regrid-{run_id}-4@example.com")
+        print("New resource link: slots rematerialized")
+        print("OK")
+    finally:
+        db.rollback()
+        db.query(Booking).filter(Booking.resource_id == resource_id).delete()
+        db.query(User).filter(User.email.like(f"regrid-{run_id}-%")).delete(synchronize_session=False)
+        db.query(Slot).filter(Slot.resource_id == resource_id).delete()
+        db.query(Schedule).filter(Schedule.resource_id == resource_id).delete()
+        db.query(AppointmentTypeResource).filter(AppointmentTypeResource.resource_id == resource_id).delete()
+        db.query(Resource).filter(Resource.id == resource_id).delete()
+        db.query(AppointmentType).filter(AppointmentType.id.in_(type_ids)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+if __name__ == "__main__":
+    check_slot_regrid()
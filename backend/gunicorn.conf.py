@@ -0,0 +1,15 @@
+"""
+Gunicorn settings, read from the working directory by default:
+
+    gunicorn -k uvicorn.workers.UvicornWorker -w 4 app.main:app
+"""
+import os
+
+
+def child_exit(server, worker):
+    # Runs in the master for every worker that exits, including crashed ones.
+    # Importing app.core.metrics here would create gauges for the master itself
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,18 @@
+from app.core.config import SLOT_HORIZON_DAYS
+from app.database import SessionLocal
+from app.services.slot_materializer import materialize_all
+
+def materialize():
+    db = SessionLocal()
+    try:
+        created = materialize_all(db)
+        db.commit()
+        print(f"Materialized {created} new slots over the next {SLOT_HORIZON_DAYS} days.")
+    except Exception as e:
+        print(f"Error materializing slots: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    materialize()
@@ -0,0 +1,21 @@
+"""
+Run the email outbox worker on its own, for deployments that set
+OUTBOX_WORKER_ENABLED=false on the web workers.
+
+    python outbox_worker.py
+"""
+from app.database import SessionLocal
+from app.services.outbox import OutboxWorker
+
+
+def run_outbox_worker():
+    worker = OutboxWorker(SessionLocal)
+    print("Sending queued email. Press Ctrl+C to stop.")
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        print("Stopped.")
+
+
+if __name__ == "__main__":
+    run_outbox_worker()
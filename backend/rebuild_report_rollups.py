@@ -0,0 +1,22 @@
+"""
+Recompute the reporting rollup tables from bookings and payments.
+Run once after migrating, or whenever the rollups need repairing.
+
+    python rebuild_report_rollups.py
+"""
+from app.database import SessionLocal
+from app.services.reporting import rebuild_rollups
+
+
+def rebuild_report_rollups():
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db)
+        db.commit()
+        print("Report rollups rebuilt.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_report_rollups()
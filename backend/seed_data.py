@@ -184,13 +184,9 @@ def seed_data():
             ),
         ]
         
-        for user in users:
-            db.add(user)
-        db.commit()
-        
-        # Refresh to get IDs
-        for user in users:
-            db.refresh(user)
+        db.add_all(users)
+        # Flushing fetches every id in one batched INSERT ... RETURNING
+        db.flush()
         
         # Create a dictionary for easy lookup
         user_dict = {u.email: u for u in users}
@@ -242,12 +238,8 @@ def seed_data():
             ),
         ]
         
-        for resource in resources:
-            db.add(resource)
-        db.commit()
-        
-        for resource in resources:
-            db.refresh(resource)
+        db.add_all(resources)
+        db.flush()
         
         resource_dict = {r.name: r for r in resources}
         
@@ -344,12 +336,8 @@ def seed_data():
             ),
         ]
         
-        for apt_type in appointment_types:
-            db.add(apt_type)
-        db.commit()
-        
-        for apt_type in appointment_types:
-            db.refresh(apt_type)
+        db.add_all(appointment_types)
+        db.flush()
         
         apt_dict = {a.name: a for a in appointment_types}
         
@@ -376,7 +364,7 @@ def seed_data():
                 resource_id=resource.id
             )
             db.add(link)
-        db.commit()
+        db.flush()
         
         print("📅 Creating schedules...")
         # Create Schedules for each resource (Mon-Fri 9am-5pm)
@@ -400,7 +388,7 @@ def seed_data():
                     is_unavailable=True
                 )
                 db.add(lunch_break)
-        db.commit()
+        db.flush()
         
         print("🕐 Creating time slots...")
         # Create Slots for the next 7 days
@@ -444,9 +432,7 @@ def seed_data():
                             db.add(slot)
                             slot_records.append(slot)
         
-        db.commit()
-        for slot in slot_records:
-            db.refresh(slot)
+        db.flush()
         
         print("❓ Creating questions...")
         # Create Questions for Appointment Types
@@ -495,12 +481,8 @@ def seed_data():
             ),
         ]
         
-        for question in questions:
-            db.add(question)
-        db.commit()
-        
-        for question in questions:
-            db.refresh(question)
+        db.add_all(questions)
+        db.flush()
         
         print("📆 Creating bookings...")
         # Create Bookings with various statuses
@@ -684,10 +666,7 @@ def seed_data():
                 slot.is_available = False
                 slot.current_bookings_count = 1
         
-        db.commit()
-        
-        for booking in booking_objects:
-            db.refresh(booking)
+        db.flush()
         
         print("📝 Creating booking answers...")
         # Create Booking Answers
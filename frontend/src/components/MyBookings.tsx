@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { API_BASE } from '../config';
 import { Calendar, Clock, CheckCircle, XCircle, AlertCircle, CalendarPlus } from 'lucide-react';
@@ -12,36 +12,140 @@ interface Booking {
     end_time: string;
     status: string;
     created_at: string | null;
+    updated_at: string | null;
 }
 
+interface BookingCache {
+    bookings: Booking[];
+    lastSync: string | null;
+    nextCursor: string | null;
+}
+
+const PAGE_SIZE = 50;
+const cacheKey = (email: string) => `myBookings:${email}`;
+
+const readCache = (email: string): BookingCache | null => {
+    try {
+        const raw = localStorage.getItem(cacheKey(email));
+        return raw ? JSON.parse(raw) : null;
+    } catch {
+        return null;
+    }
+};
+
+// Newest first, the order the endpoint pages in
+const byStartDesc = (a: Booking, b: Booking) =>
+    b.start_time.localeCompare(a.start_time) || b.id - a.id;
+
+// Fold changed rows into the list, replacing older copies by id
+const mergeBookings = (current: Booking[], changed: Booking[]) => {
+    const merged = new Map(current.map((booking) => [booking.id, booking]));
+    changed.forEach((booking) => merged.set(booking.id, booking));
+    return Array.from(merged.values()).sort(byStartDesc);
+};
+
+const latestUpdate = (rows: Booking[], since: string | null) =>
+    rows.reduce<string | null>(
+        (latest, row) => (row.updated_at && (!latest || new Date(row.updated_at) > new Date(latest)) ? row.updated_at : latest),
+        since
+    );
+
 const MyBookings: React.FC = () => {
     const { user, loading: authLoading } = useAuth();
     const [bookings, setBookings] = useState<Booking[]>([]);
     const [loading, setLoading] = useState<boolean>(true);
+    const [loadingMore, setLoadingMore] = useState<boolean>(false);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const cache = useRef<BookingCache>({ bookings: [], lastSync: null, nextCursor: null });
 
     useEffect(() => {
         if (user?.email) {
-            fetchBookings(user.email);
+            syncBookings(user.email);
         } else if (!authLoading) {
             setLoading(false);
         }
     }, [user, authLoading]);
 
-    const fetchBookings = async (email: string) => {
-        setLoading(true);
+    const saveCache = (email: string, next: BookingCache) => {
+        cache.current = next;
+        setBookings(next.bookings);
+        setNextCursor(next.nextCursor);
         try {
-            const response = await axios.get<Booking[]>(`${API_BASE}/bookings`, {
-                params: { customer_email: email }
-            });
-            setBookings(response.data);
+            localStorage.setItem(cacheKey(email), JSON.stringify(next));
+        } catch {
+            // Storage full or disabled: the list still works for this visit
+        }
+    };
+
+    const fetchPage = (email: string, params: { cursor?: string; updated_since?: string }) =>
+        axios.get<Booking[]>(`${API_BASE}/bookings`, {
+            params: { customer_email: email, limit: PAGE_SIZE, ...params }
+        });
+
+    const syncBookings = async (email: string) => {
+        const cached = readCache(email);
+        if (cached?.lastSync) {
+            // Show what we have, then ask only for bookings changed since
+            cache.current = cached;
+            setBookings(cached.bookings);
+            setNextCursor(cached.nextCursor);
+            setLoading(false);
+        } else {
+            setLoading(true);
+        }
+
+        try {
+            if (cached?.lastSync) {
+                const changed: Booking[] = [];
+                let cursor: string | undefined;
+                do {
+                    const response = await fetchPage(email, { updated_since: cached.lastSync, cursor });
+                    changed.push(...response.data);
+                    cursor = response.headers['x-next-cursor'] || undefined;
+                } while (cursor);
+                if (changed.length > 0) {
+                    saveCache(email, {
+                        bookings: mergeBookings(cached.bookings, changed),
+                        lastSync: latestUpdate(changed, cached.lastSync),
+                        nextCursor: cached.nextCursor,
+                    });
+                }
+            } else {
+                const response = await fetchPage(email, {});
+                saveCache(email, {
+                    bookings: [...response.data].sort(byStartDesc),
+                    lastSync: latestUpdate(response.data, null),
+                    nextCursor: response.headers['x-next-cursor'] || null,
+                });
+            }
         } catch (error) {
             console.error("Error fetching bookings:", error);
-            setBookings([]);
+            if (!cached?.lastSync) {
+                setBookings([]);
+            }
         } finally {
             setLoading(false);
         }
     };
 
+    const loadMore = async () => {
+        if (!user?.email || !nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const response = await fetchPage(user.email, { cursor: nextCursor });
+            saveCache(user.email, {
+                bookings: mergeBookings(cache.current.bookings, response.data),
+                // Older pages say nothing about changes to rows already shown
+                lastSync: cache.current.lastSync,
+                nextCursor: response.headers['x-next-cursor'] || null,
+            });
+        } catch (error) {
+            console.error("Error loading more bookings:", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const formatDateTime = (dateStr: string) => {
         const date = new Date(dateStr);
         return {
@@ -119,7 +223,7 @@ const MyBookings: React.FC = () => {
             <div className="dashboard-card">
                 <div className="card-header">
                     <h3>Your Appointments</h3>
-                    <span className="text-sm text-gray-500">{bookings.length} bookings found</span>
+                    <span className="text-sm text-gray-500">{bookings.length}{nextCursor ? '+' : ''} bookings found</span>
                 </div>
 
                 {loading ? (
@@ -185,6 +289,17 @@ const MyBookings: React.FC = () => {
                                 </div>
                             );
                         })}
+                        {nextCursor && (
+                            <div className="p-5 text-center">
+                                <button
+                                    onClick={loadMore}
+                                    disabled={loadingMore}
+                                    className="px-4 py-2 rounded-lg bg-gray-100 hover:bg-gray-200 transition-colors text-gray-700 text-sm font-semibold disabled:opacity-50"
+                                >
+                                    {loadingMore ? 'Loading...' : 'Load older bookings'}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 )}
             </div>
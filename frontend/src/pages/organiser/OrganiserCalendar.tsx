@@ -13,13 +13,28 @@ import { API_BASE } from "../../config";
 interface Appointment {
     id: number;
     customer_name: string;
-    customer_email: string;
     service_name: string;
     start_time: string;
     end_time: string;
     status: string;
 }
 
+interface CalendarEvent {
+    id: number;
+    start: string;
+    end: string;
+    resource_id: number | null;
+    status: string;
+    service_id: number;
+    customer_id: number;
+}
+
+interface CalendarFeed {
+    events: CalendarEvent[];
+    services: Record<string, string>;
+    customers: Record<string, string>;
+}
+
 export default function OrganiserCalendar() {
     const [selectedDate, setSelectedDate] = useState<string>(
         new Date().toISOString().split("T")[0]
@@ -30,18 +45,24 @@ export default function OrganiserCalendar() {
     const fetchAppointments = async () => {
         setLoading(true);
         try {
-            const response = await axios.get(`${API_BASE}/admin/appointments`, {
+            const response = await axios.get<CalendarFeed>(`${API_BASE}/calendar/feed`, {
                 params: {
-                    date_from: selectedDate,
-                    date_to: selectedDate,
+                    start: selectedDate,
+                    end: selectedDate,
                 },
             });
-            // Sort by start time
-            const sorted = (response.data.appointments || []).sort(
-                (a: Appointment, b: Appointment) =>
-                    new Date(a.start_time).getTime() - new Date(b.start_time).getTime()
+            // Events arrive sorted by start time; names come from the side dictionaries
+            const { events, services, customers } = response.data;
+            setAppointments(
+                events.map((event) => ({
+                    id: event.id,
+                    customer_name: customers[event.customer_id] || "Unknown",
+                    service_name: services[event.service_id] || "Unknown Service",
+                    start_time: event.start,
+                    end_time: event.end,
+                    status: event.status || "",
+                }))
             );
-            setAppointments(sorted);
         } catch (error) {
             console.error("Error fetching appointments:", error);
             setAppointments([]);
@@ -309,10 +309,8 @@ export default function OrganiserReports() {
     const fetchReportData = async () => {
         setLoading(true);
         try {
-            const [appointmentData, servicesData] = await Promise.all([
-                axios.get(`${API_BASE}/admin/appointments`),
-                axios.get(`${API_BASE}/services?published_only=false`),
-            ]);
+            // Totals and the per-service breakdown both come from the rollups
+            const appointmentData = await axios.get(`${API_BASE}/reports/bookings`);
 
             setAppointmentStats({
                 total: appointmentData.data.total,
@@ -322,7 +320,7 @@ export default function OrganiserReports() {
                 completed_count: appointmentData.data.completed_count,
             });
 
-            setServices(servicesData.data || []);
+            setServices(appointmentData.data.services || []);
         } catch (error) {
             console.error("Failed to fetch report data:", error);
         } finally {